@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""Mixed read/write load test for the giveaway API.
+
+Starts the FastAPI app in-process (no network, no uvicorn), backed either
+by an in-memory Mongo stand-in (mongomock-motor) or a real ``mongod``,
+seeds it with giveaways, then drives concurrent list/active/stats/enter/
+create/update/delete traffic and prints throughput and latency percentiles per
+endpoint as JSON, so runs can be compared across commits.
+
+    python backend/benchmarks/load_test.py --sizes 1000 10000
+    python backend/benchmarks/load_test.py --mongo-url mongodb://localhost:27017 --sizes 100000
+
+The in-memory stand-in has no query planner and checks unique indexes by
+scanning, so its absolute numbers at large sizes mostly measure mongomock;
+use it to compare commits, and a real mongod for capacity figures.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+# The benchmark mints its own admin tokens, so any password and secret will do
+os.environ.setdefault("ADMIN_DEV_DEFAULTS", "true")
+
+import server  # noqa: E402
+
+DEFAULT_MIX = "list=40,active=25,stats=20,create=5,update=5,delete=5"
+SEED_BATCH_SIZE = 1000
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight)
+    unknown = set(mix).difference(OPERATIONS)
+    if unknown:
+        raise SystemExit(f"Unknown operations in --mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def giveaway_body(now: datetime) -> dict:
+    return {
+        "title": "Load test giveaway",
+        "description": "Generated by backend/benchmarks/load_test.py",
+        "prize": "Discord Nitro",
+        "endDate": (now + timedelta(days=random.randint(1, 30))).isoformat(),
+        "entryRequirement": "Join our Discord server",
+    }
+
+
+def seed_doc(now: datetime, index: int) -> dict:
+    # A third of the seeded giveaways have already ended
+    end_offset = timedelta(days=random.randint(-30, 60))
+    return {
+        "id": str(uuid.uuid4()),
+        "title": f"Seeded giveaway #{index}",
+        "description": "Seeded by backend/benchmarks/load_test.py " * 4,
+        "prize": random.choice(["Discord Nitro", "Steam gift card", "Gaming mouse"]),
+        "endDate": now + end_offset,
+        "entryRequirement": "Join our Discord server",
+        "createdAt": now - timedelta(seconds=index),
+        "version": 0,
+    }
+
+
+async def seed(collection, count: int) -> List[str]:
+    """Insert ``count`` giveaways before the app starts.
+
+    Seeding ahead of startup means indexes are built once over the loaded
+    data rather than maintained per insert, and startup loads the counters.
+    """
+    now = datetime.now(timezone.utc)
+    ids = []
+    for start in range(0, count, SEED_BATCH_SIZE):
+        docs = [seed_doc(now, i) for i in range(start, min(count, start + SEED_BATCH_SIZE))]
+        await collection.insert_many(docs, ordered=False)
+        ids.extend(doc["id"] for doc in docs)
+    return ids
+
+
+class LoadState:
+    """Ids the write operations can target, shared by all workers"""
+
+    def __init__(self, ids: List[str]):
+        self.ids = ids
+
+    def pick(self) -> str:
+        return random.choice(self.ids) if self.ids else "missing"
+
+    def take(self) -> str:
+        if not self.ids:
+            return "missing"
+        index = random.randrange(len(self.ids))
+        self.ids[index], self.ids[-1] = self.ids[-1], self.ids[index]
+        return self.ids.pop()
+
+
+async def op_list(client, state):
+    return await client.get("/api/giveaways")
+
+
+async def op_active(client, state):
+    return await client.get("/api/giveaways/active")
+
+
+async def op_stats(client, state):
+    return await client.get("/api/stats")
+
+
+async def op_enter(client, state):
+    # Ended or archived targets answer 409/404, which the error count ignores
+    return await client.post(
+        f"/api/giveaways/{state.pick()}/entries",
+        json={"userId": f"load-test-{random.randrange(1_000_000)}"},
+    )
+
+
+async def op_create(client, state):
+    response = await client.post("/api/admin/giveaways", json=giveaway_body(datetime.now(timezone.utc)))
+    if response.status_code == 200:
+        state.ids.append(response.json()["id"])
+    return response
+
+
+async def op_update(client, state):
+    return await client.put(
+        f"/api/admin/giveaways/{state.pick()}",
+        json=giveaway_body(datetime.now(timezone.utc)),
+    )
+
+
+async def op_delete(client, state):
+    return await client.delete(f"/api/admin/giveaways/{state.take()}")
+
+
+OPERATIONS = {
+    "list": op_list,
+    "active": op_active,
+    "stats": op_stats,
+    "enter": op_enter,
+    "create": op_create,
+    "update": op_update,
+    "delete": op_delete,
+}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+async def drive(client, state: LoadState, mix: Dict[str, int], concurrency: int, duration: float) -> dict:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights)[0]
+            started = time.perf_counter()
+            response = await OPERATIONS[name](client, state)
+            latencies[name].append(time.perf_counter() - started)
+            if response.status_code >= 500 or (response.status_code >= 400 and name not in ("enter", "update", "delete")):
+                errors[name] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name in names:
+        values = sorted(latencies[name])
+        endpoints[name] = {
+            "requests": len(values),
+            "errors": errors[name],
+            "throughputRps": round(len(values) / elapsed, 1),
+            "p50Ms": round(percentile(values, 0.50) * 1000, 2),
+            "p95Ms": round(percentile(values, 0.95) * 1000, 2),
+            "p99Ms": round(percentile(values, 0.99) * 1000, 2),
+        }
+    total = sum(len(values) for values in latencies.values())
+    return {"elapsedSeconds": round(elapsed, 2), "throughputRps": round(total / elapsed, 1), "endpoints": endpoints}
+
+
+async def run_size(size: int, args, mix: Dict[str, int]) -> dict:
+    repository = server.giveaway_repository
+    repository.db_name = f"rbc_load_test_{uuid.uuid4().hex[:8]}"
+    if args.mongo_url:
+        repository.mongo_url = args.mongo_url
+        seed_client = repository.client_factory(args.mongo_url, tz_aware=True, tzinfo=timezone.utc)
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            raise SystemExit("mongomock-motor is required without --mongo-url (pip install mongomock-motor)")
+        # The stand-in keeps data per client, so the app must reuse the seeded one
+        seed_client = AsyncMongoMockClient(tz_aware=True, tzinfo=timezone.utc)
+        repository.client_factory = lambda *_, **__: seed_client
+
+    seed_started = time.perf_counter()
+    ids = await seed(seed_client[repository.db_name].giveaways, size)
+    seed_seconds = time.perf_counter() - seed_started
+    # Every request comes from one client here, which the rate limiter would throttle
+    server.rate_limiter.enabled = False
+    await server.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        # Minted directly rather than via /api/admin/login, whose password hash is slow by design
+        headers = {"Authorization": f"Bearer {server.issue_admin_token()}"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", headers=headers) as client:
+            result = await drive(client, LoadState(ids), mix, args.concurrency, args.duration)
+        return {"seeded": size, "seedSeconds": round(seed_seconds, 2), **result}
+    finally:
+        if args.mongo_url:
+            await seed_client.drop_database(repository.db_name)
+            seed_client.close()
+        await server.app.router.shutdown()
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--mongo-url", help="Real mongod to use; a throwaway database is created and dropped")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of traffic per seed size")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    report = {
+        "revision": git_revision(),
+        "mongo": "mongod" if args.mongo_url else "in-memory",
+        "concurrency": args.concurrency,
+        "durationSeconds": args.duration,
+        "mix": mix,
+        "runs": [await run_size(size, args, mix) for size in args.sizes],
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
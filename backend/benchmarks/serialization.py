@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Per-request CPU cost of rendering giveaway listings.
+
+Compares the original response path (``giveaway_to_dict`` per document,
+FastAPI validation against ``List[GiveawayResponse]`` and the stdlib JSON
+encoder) with the current one (projected documents rendered straight to
+bytes by ``RenderedBody``). No database is needed; documents are generated
+in the shape the projected Mongo query returns them.
+
+    python backend/benchmarks/serialization.py --sizes 1000 10000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+# Nothing here logs in, so any admin password and secret will do
+os.environ.setdefault("ADMIN_DEV_DEFAULTS", "true")
+
+import server  # noqa: E402
+
+
+def make_docs(count: int) -> List[dict]:
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Giveaway #{i}",
+            "description": "Win a prize by joining the RBC Discord server and reacting to the announcement. " * 3,
+            "prize": "Discord Nitro",
+            "endDate": now + timedelta(days=7, minutes=i),
+            "entryRequirement": "Join our Discord server",
+            "createdAt": now - timedelta(minutes=i),
+            "version": 0,
+        }
+        for i in range(count)
+    ]
+
+
+LEGACY_FIELD = create_response_field(name="Response_get_giveaways", type_=List[server.GiveawayResponse])
+
+
+async def legacy_render(docs: List[dict]) -> bytes:
+    content = [server.giveaway_to_dict(doc) for doc in docs]
+    content = await serialize_response(field=LEGACY_FIELD, response_content=content)
+    return JSONResponse(content).body
+
+
+async def current_render(docs: List[dict]) -> bytes:
+    return server.RenderedBody(docs).body
+
+
+def measure(render, docs: List[dict], repeat: int) -> float:
+    """Median CPU milliseconds per call"""
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    try:
+        samples = []
+        for _ in range(repeat):
+            started = time.process_time()
+            loop.run_until_complete(render(docs))
+            samples.append((time.process_time() - started) * 1000)
+        return statistics.median(samples)
+    finally:
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        docs = make_docs(size)
+        legacy = measure(legacy_render, docs, args.repeat)
+        current = measure(current_render, docs, args.repeat)
+        results.append({
+            "items": size,
+            "legacyCpuMs": round(legacy, 2),
+            "currentCpuMs": round(current, 2),
+            "speedup": round(legacy / current, 1) if current else None,
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
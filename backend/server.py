@@ -1,24 +1,1804 @@
-from fastapi import FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
-from pymongo import MongoClient
-from datetime import datetime
+from pydantic import BaseModel, Field, ValidationError
+from motor.motor_asyncio import AsyncIOMotorClient
+from passlib.context import CryptContext
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from pymongo import monitoring
+from pymongo import ASCENDING, DESCENDING, TEXT, CursorType, DeleteOne, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import (
+    BulkWriteError, CollectionInvalid, ConnectionFailure, ExecutionTimeout, PyMongoError, WaitQueueTimeoutError
+)
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+import asyncio
+import base64
+import functools
+import glob
+import hashlib
+import heapq
+import itertools
+import json
+import jwt
+import logging
+import mimetypes
+import numpy as np
+import orjson
 import os
+import pandas as pd
+import random
+import re
+import secrets
+import sys
+import tempfile
+import time
 import uuid
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
 
 # Environment variables
 MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/')
+READ_CACHE_TTL_SECONDS = float(os.environ.get('READ_CACHE_TTL_SECONDS', '30'))
+STREAM_QUEUE_SIZE = int(os.environ.get('STREAM_QUEUE_SIZE', '64'))
+STREAM_KEEPALIVE_SECONDS = float(os.environ.get('STREAM_KEEPALIVE_SECONDS', '15'))
+# static:<n>, file:<path> or discord:<invite code>
+MEMBER_COUNT_SOURCE = os.environ.get('MEMBER_COUNT_SOURCE', 'static:500')
+MEMBER_COUNT_REFRESH_SECONDS = float(os.environ.get('MEMBER_COUNT_REFRESH_SECONDS', '600'))
+ARCHIVE_RETENTION_DAYS = float(os.environ.get('ARCHIVE_RETENTION_DAYS', '30'))
+ENTRY_FLUSH_SIZE = int(os.environ.get('ENTRY_FLUSH_SIZE', '500'))
+ENTRY_FLUSH_INTERVAL_SECONDS = float(os.environ.get('ENTRY_FLUSH_INTERVAL_SECONDS', '1'))
+BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', '500'))
+BULK_MAX_LINE_BYTES = 1024 * 1024
+BULK_MAX_REPORTED_ERRORS = 1000
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+# Unset means no socket timeout, which long exports and change streams rely on
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ['MONGO_SOCKET_TIMEOUT_MS']) if os.environ.get('MONGO_SOCKET_TIMEOUT_MS') else None
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2000'))
+MONGO_CONNECT_ON_STARTUP = os.environ.get('MONGO_CONNECT_ON_STARTUP', 'true').lower() in ('1', 'true', 'yes')
+DB_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('DB_CIRCUIT_FAILURE_THRESHOLD', '5'))
+DB_CIRCUIT_RESET_SECONDS = float(os.environ.get('DB_CIRCUIT_RESET_SECONDS', '10'))
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.environ.get('HEALTH_PROBE_INTERVAL_SECONDS', '5'))
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+# How many reverse proxies append to X-Forwarded-For in front of the app (1 on Railway,
+# Render and Heroku). 0 keys on the socket peer, which behind a proxy is the proxy itself.
+RATE_LIMIT_TRUSTED_PROXIES = int(os.environ.get('RATE_LIMIT_TRUSTED_PROXIES', '0'))
+RATE_LIMIT_PUBLIC_PER_SECOND = float(os.environ.get('RATE_LIMIT_PUBLIC_PER_SECOND', '20'))
+RATE_LIMIT_PUBLIC_BURST = float(os.environ.get('RATE_LIMIT_PUBLIC_BURST', '60'))
+RATE_LIMIT_ADMIN_PER_SECOND = float(os.environ.get('RATE_LIMIT_ADMIN_PER_SECOND', '10'))
+RATE_LIMIT_ADMIN_BURST = float(os.environ.get('RATE_LIMIT_ADMIN_BURST', '50'))
+RATE_LIMIT_LOGIN_PER_MINUTE = float(os.environ.get('RATE_LIMIT_LOGIN_PER_MINUTE', '5'))
+RATE_LIMIT_LOGIN_BURST = float(os.environ.get('RATE_LIMIT_LOGIN_BURST', '5'))
+LOOP_LAG_INTERVAL_SECONDS = float(os.environ.get('LOOP_LAG_INTERVAL_SECONDS', '0.5'))
+SERVE_FRONTEND = os.environ.get('SERVE_FRONTEND', '').lower() in ('1', 'true', 'yes')
+FRONTEND_BUILD_DIR = os.environ.get(
+    'FRONTEND_BUILD_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'build')
+)
+GZIP_MINIMUM_SIZE = int(os.environ.get('GZIP_MINIMUM_SIZE', '1024'))
+# WEB_CONCURRENCY is also what gunicorn reads for its default worker count
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', '1'))
+# auto: only needed when more than one worker shares the database
+CHANGE_BUS = os.environ.get('CHANGE_BUS', 'auto').lower()
+CHANGE_BUS_SIZE_BYTES = 8 * 1024 * 1024
+# Read by prometheus_client itself; set, every worker writes its metrics to files
+# there and /metrics merges them. `python server.py` sets it up for several workers.
+PROMETHEUS_MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+# A passlib hash, e.g. from passlib.hash.pbkdf2_sha256.hash(password)
+ADMIN_PASSWORD_HASH = os.environ.get('ADMIN_PASSWORD_HASH')
+ADMIN_TOKEN_SECRET = os.environ.get('ADMIN_TOKEN_SECRET')
+ADMIN_TOKEN_TTL_SECONDS = int(os.environ.get('ADMIN_TOKEN_TTL_SECONDS', '3600'))
+# Local development only: default admin password and a per-process token secret
+ADMIN_DEV_DEFAULTS = os.environ.get('ADMIN_DEV_DEFAULTS', '').lower() in ('1', 'true', 'yes')
+
+# Metrics
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time from request to last response byte",
+    ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command round-trip time",
+    ["command", "outcome"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a scheduled wakeup",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+RATE_LIMITED = Counter("http_rate_limited_total", "Requests rejected with 429 by budget", ["budget"])
+COALESCED_READS = Counter("read_requests_coalesced_total", "Reads that joined an identical in-flight query", ["endpoint"])
+# multiprocess_mode says how workers' values combine; it is ignored with a single process
+MONGO_POOL_IN_USE = Gauge(
+    "mongo_pool_connections_in_use", "Pooled MongoDB connections checked out", multiprocess_mode="livesum"
+)
+MONGO_POOL_WAITING = Gauge(
+    "mongo_pool_checkout_waiting", "Operations waiting for a pooled MongoDB connection", multiprocess_mode="livesum"
+)
+DB_CIRCUIT_OPEN = Gauge(
+    "mongo_circuit_open", "1 while the database circuit breaker is rejecting calls", multiprocess_mode="livemax"
+)
+STREAM_SUBSCRIBERS = Gauge("giveaway_stream_subscribers", "Connected change feed clients", multiprocess_mode="livesum")
+ENTRIES_PENDING = Gauge(
+    "giveaway_entries_pending", "Accepted entries not yet written to MongoDB", multiprocess_mode="livesum"
+)
+ENTRY_FLUSH_SIZE_HISTOGRAM = Histogram(
+    "giveaway_entry_flush_size", "Entries written per buffered flush",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+
+# Long-lived responses would swamp the latency histogram, so they are only counted
+UNTIMED_ROUTES = {"/api/giveaways/stream", "/api/admin/giveaways/export"}
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Records the duration of every command the motor client sends"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        MONGO_COMMAND_LATENCY.labels(event.command_name, "success").observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        MONGO_COMMAND_LATENCY.labels(event.command_name, "failure").observe(event.duration_micros / 1e6)
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Tracks connection pool usage for /api/health and the pool gauges"""
+
+    def __init__(self):
+        self.open = 0
+        self.in_use = 0
+        self.waiting = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.open -= 1
+
+    def connection_check_out_started(self, event):
+        self.waiting += 1
+        MONGO_POOL_WAITING.set(self.waiting)
+
+    def connection_check_out_failed(self, event):
+        self.waiting -= 1
+        MONGO_POOL_WAITING.set(self.waiting)
+
+    def connection_checked_out(self, event):
+        self.waiting -= 1
+        self.in_use += 1
+        MONGO_POOL_WAITING.set(self.waiting)
+        MONGO_POOL_IN_USE.set(self.in_use)
+
+    def connection_checked_in(self, event):
+        self.in_use -= 1
+        MONGO_POOL_IN_USE.set(self.in_use)
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts and latency per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # FastAPI puts the matched route in the scope; unmatched paths
+            # share one label to keep cardinality bounded
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUESTS.labels(scope["method"], route_path, str(status_code)).inc()
+            if route_path not in UNTIMED_ROUTES:
+                HTTP_LATENCY.labels(scope["method"], route_path).observe(time.perf_counter() - started)
+
+class CacheMetricsCollector:
+    """Exposes the read cache counters at scrape time"""
+
+    def collect(self):
+        stats = read_cache.stats()
+        yield CounterMetricFamily("read_cache_hits", "Read cache hits", value=stats["hits"])
+        yield CounterMetricFamily("read_cache_misses", "Read cache misses", value=stats["misses"])
+        yield GaugeMetricFamily("read_cache_hit_ratio", "Read cache hits / lookups", value=stats["hitRatio"])
+        yield GaugeMetricFamily("read_cache_entries", "Entries held by the read cache", value=stats["entries"])
+
+async def monitor_event_loop_lag():
+    """Sleep for a fixed interval and record how much later than asked we woke up"""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL_SECONDS)
+        EVENT_LOOP_LAG.observe(max(0.0, time.perf_counter() - started - LOOP_LAG_INTERVAL_SECONDS))
+
+# Data access layer
+class DatabaseUnavailable(HTTPException):
+    """Raised instead of waiting on a database that is down or overloaded"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database temporarily unavailable",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))}
+        )
+
+class CircuitBreaker:
+    """Fails database calls fast after repeated connection failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected without touching the driver. Once ``reset_timeout``
+    has passed, one trial call is let through: success closes the circuit
+    again and failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._changed_at = time.monotonic()
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        # Also covers a half-open trial that never reported back
+        if time.monotonic() - self._changed_at >= self.reset_timeout:
+            self._set_state("half-open")
+            return True
+        return False
+
+    def retry_after(self) -> float:
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._changed_at))
+
+    def record_success(self):
+        self.failures = 0
+        if self.state != "closed":
+            logger.info("Database reachable again, closing circuit")
+            self._set_state("closed")
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning("Opening database circuit after %d failures", self.failures)
+            self._set_state("open")
+
+    def _set_state(self, state: str):
+        self.state = state
+        self._changed_at = time.monotonic()
+        DB_CIRCUIT_OPEN.set(1 if state == "open" else 0)
+
+def guarded(method):
+    """Run a repository call through the repository's circuit breaker.
+
+    Connection failures and timeouts become ``DatabaseUnavailable`` (503)
+    rather than surfacing the driver's message as a 500. Waiting for a
+    pooled connection is load, not an outage, so it does not count
+    towards opening the circuit.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        breaker = self.breaker
+        if not breaker.allow():
+            raise DatabaseUnavailable(breaker.retry_after())
+        try:
+            result = await method(self, *args, **kwargs)
+        except WaitQueueTimeoutError as e:
+            raise DatabaseUnavailable(1) from e
+        except (ConnectionFailure, ExecutionTimeout) as e:
+            breaker.record_failure()
+            logger.warning("Database call %s failed: %s", method.__name__, e)
+            raise DatabaseUnavailable(breaker.retry_after()) from e
+        except Exception:
+            # The server answered, even if with an error
+            breaker.record_success()
+            raise
+        breaker.record_success()
+        return result
+    return wrapper
+
+def guarded_iter(method):
+    """``guarded`` for async generators that stream a cursor.
+
+    The circuit is checked before the first batch is fetched, and a
+    connection failure partway through counts against it like any other
+    call.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        breaker = self.breaker
+        if not breaker.allow():
+            raise DatabaseUnavailable(breaker.retry_after())
+        try:
+            async for item in method(self, *args, **kwargs):
+                yield item
+        except WaitQueueTimeoutError as e:
+            raise DatabaseUnavailable(1) from e
+        except (ConnectionFailure, ExecutionTimeout) as e:
+            breaker.record_failure()
+            logger.warning("Database cursor %s failed: %s", method.__name__, e)
+            raise DatabaseUnavailable(breaker.retry_after()) from e
+        except Exception:
+            breaker.record_success()
+            raise
+        breaker.record_success()
+    return wrapper
+
+class GiveawayRepository:
+    """Async MongoDB access for giveaway documents.
+
+    Every route goes through this class so that database round-trips are
+    awaited on the event loop instead of blocking it. The motor client is
+    created on application startup and closed on shutdown.
+    """
+
+    def __init__(self, mongo_url: str, db_name: str = "rbc_community", client_factory=AsyncIOMotorClient):
+        self.mongo_url = mongo_url
+        self.db_name = db_name
+        # Swappable so tools can run the app against an in-memory stand-in
+        self.client_factory = client_factory
+        self.breaker = CircuitBreaker(DB_CIRCUIT_FAILURE_THRESHOLD, DB_CIRCUIT_RESET_SECONDS)
+        self.pool = PoolMetrics()
+        self.client = None
+        self.db = None
+        self.collection = None
+        self.archive = None
+        self.entries = None
+        self.migrations = None
+
+    async def connect(self):
+        """Create the motor client and bind the collections.
+
+        With ``MONGO_CONNECT_ON_STARTUP`` off the driver only starts
+        connecting on the first operation.
+        """
+        self.pool = PoolMetrics()
+        self.client = self.client_factory(
+            self.mongo_url,
+            tz_aware=True,
+            tzinfo=timezone.utc,
+            event_listeners=[MongoCommandMetrics(), self.pool],
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+            socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+            waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            connect=MONGO_CONNECT_ON_STARTUP,
+        )
+        self.db = self.client[self.db_name]
+        self.collection = self.db.giveaways
+        self.archive = self.db.giveaways_archive
+        self.entries = self.db.entries
+        self.migrations = self.db.migrations
+
+    def close(self):
+        """Close the motor client and release its connection pool"""
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+    @guarded
+    async def ping(self):
+        await self.db.command('ping')
+
+    @guarded
+    async def ensure_indexes(self):
+        """Create the indexes the listing, active and stats queries rely on"""
+        await self.collection.create_index([("id", ASCENDING)], unique=True)
+        await self.collection.create_index([("createdAt", DESCENDING), ("id", DESCENDING)])
+        await self.collection.create_index([("endDate", ASCENDING), ("id", ASCENDING)])
+        await self.collection.create_index([("prize", ASCENDING), ("endDate", ASCENDING), ("id", ASCENDING)])
+        await self.collection.create_index(
+            [("title", TEXT), ("description", TEXT), ("prize", TEXT)],
+            weights={"title": 10, "prize": 5, "description": 1},
+            name="giveaway_text",
+        )
+        await self.archive.create_index([("id", ASCENDING)], unique=True)
+        await self.archive.create_index([("createdAt", DESCENDING), ("id", DESCENDING)])
+        await self.entries.create_index([("giveawayId", ASCENDING), ("userId", ASCENDING)], unique=True)
+
+    @guarded
+    async def migrate_dates(self, batch_size: int = 500) -> int:
+        """Convert legacy string dates to BSON dates.
+
+        Older documents stored ``endDate``/``createdAt``/``updatedAt`` as the
+        raw strings sent by the client, which only compare lexicographically.
+        No index serves the ``$type`` query, so this scans the collection;
+        ``run_migration`` records completion so it only runs once.
+        """
+        date_fields = ("endDate", "createdAt", "updatedAt")
+        query = {"$or": [{field: {"$type": "string"}} for field in date_fields]}
+        projection = {field: 1 for field in date_fields}
+        migrated = 0
+        operations = []
+        async for doc in self.collection.find(query, projection):
+            update = {}
+            for field in date_fields:
+                value = doc.get(field)
+                if not isinstance(value, str):
+                    continue
+                try:
+                    update[field] = parse_datetime(value)
+                except ValueError:
+                    logger.warning("Skipping unparseable %s on giveaway %s", field, doc["_id"])
+            if update:
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": update}))
+            if len(operations) >= batch_size:
+                await self.collection.bulk_write(operations, ordered=False)
+                migrated += len(operations)
+                operations = []
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+            migrated += len(operations)
+        return migrated
+
+    @guarded
+    async def list_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None,
+        projection: Optional[dict] = None,
+        include_archived: bool = False,
+    ) -> List[dict]:
+        """Return up to ``limit`` giveaways, newest first, after a keyset cursor.
+
+        Ordering is (createdAt, id) descending so that the compound index
+        serves both the sort and the cursor range without skipping documents.
+        With ``include_archived`` the same page is read from the archive too
+        and the two sorted pages are merged. ``projection`` must keep
+        ``createdAt`` and ``id``.
+        """
+        query = {}
+        if after is not None:
+            created_at, giveaway_id = after
+            query = {"$or": [
+                {"createdAt": {"$lt": created_at}},
+                {"createdAt": created_at, "id": {"$lt": giveaway_id}},
+            ]}
+        collections = [self.collection, self.archive] if include_archived else [self.collection]
+        pages = []
+        for collection in collections:
+            cursor = collection.find(query, projection).sort(
+                [("createdAt", DESCENDING), ("id", DESCENDING)]
+            ).limit(limit)
+            pages.append(await cursor.to_list(length=limit))
+        if len(pages) == 1:
+            return pages[0]
+        merged = heapq.merge(*pages, key=lambda doc: (doc["createdAt"], doc["id"]), reverse=True)
+        return list(merged)[:limit]
+
+    @guarded
+    async def is_replica_set(self) -> bool:
+        """Change streams need a replica set or sharded cluster"""
+        hello = await self.client.admin.command("hello")
+        return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+    @guarded
+    async def stats_snapshot(self, now: datetime) -> Tuple[int, List[dict]]:
+        """Total count and the (id, endDate) of active giveaways in one round-trip"""
+        pipeline = [{"$facet": {
+            "total": [{"$count": "count"}],
+            "active": [
+                {"$match": {"endDate": {"$gt": now}}},
+                {"$project": {"_id": 0, "id": 1, "endDate": 1}},
+            ],
+        }}]
+        result = await self.collection.aggregate(pipeline).to_list(length=1)
+        facet = result[0]
+        total = facet["total"][0]["count"] if facet["total"] else 0
+        return total, facet["active"]
+
+    @guarded
+    async def backfill_versions(self) -> int:
+        """Give documents written before versioning an explicit version 0"""
+        result = await self.collection.update_many(
+            {"version": {"$exists": False}},
+            {"$set": {"version": 0}}
+        )
+        return result.modified_count
+
+    @guarded
+    async def migration_done(self, name: str) -> bool:
+        return await self.migrations.find_one({"_id": name}) is not None
+
+    @guarded
+    async def mark_migration_done(self, name: str):
+        await self.migrations.update_one(
+            {"_id": name}, {"$setOnInsert": {"completedAt": utcnow()}}, upsert=True
+        )
+
+    @guarded
+    async def list_active(self, now: datetime, projection: Optional[dict] = None) -> List[dict]:
+        cursor = self.collection.find({"endDate": {"$gt": now}}, projection).sort("endDate", 1)
+        return await cursor.to_list(length=None)
+
+    @guarded
+    async def search(
+        self,
+        text: Optional[str],
+        filters: dict,
+        limit: int,
+        after: Optional[Tuple[Any, str]] = None,
+        projection: Optional[dict] = None,
+    ) -> List[dict]:
+        """Return up to ``limit`` giveaways matching ``text`` and ``filters``.
+
+        With ``text`` the text index finds the matches and they are ranked by
+        relevance, highest first, with the score returned as ``score``.
+        Without it they come in endDate order from the (prize, endDate, id)
+        or (endDate, id) index. Either way the cursor is a keyset on the
+        sort key plus id, so later pages cost no more than the first.
+        """
+        if not text:
+            query = dict(filters)
+            if after is not None:
+                end_date, giveaway_id = after
+                query["$or"] = [
+                    {"endDate": {"$gt": end_date}},
+                    {"endDate": end_date, "id": {"$gt": giveaway_id}},
+                ]
+            cursor = self.collection.find(query, projection).sort(
+                [("endDate", ASCENDING), ("id", ASCENDING)]
+            ).limit(limit)
+            return await cursor.to_list(length=limit)
+
+        # The text score only exists inside a pipeline, so ranking and the
+        # keyset on it have to be aggregation stages
+        pipeline = [
+            {"$match": {"$text": {"$search": text}, **filters}},
+            {"$addFields": {"score": {"$meta": "textScore"}}},
+        ]
+        if after is not None:
+            score, giveaway_id = after
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": score}},
+                {"score": score, "id": {"$gt": giveaway_id}},
+            ]}})
+        pipeline.append({"$sort": {"score": -1, "id": 1}})
+        pipeline.append({"$limit": limit})
+        if projection is not None:
+            pipeline.append({"$project": {**projection, "score": 1}})
+        return await self.collection.aggregate(pipeline).to_list(length=limit)
+
+    @guarded
+    async def count(self, query: Optional[dict] = None) -> int:
+        return await self.collection.count_documents(query or {})
+
+    @guarded
+    async def count_archived(self) -> int:
+        return await self.archive.count_documents({})
+
+    @guarded
+    async def oldest_end(self) -> Optional[datetime]:
+        """Earliest endDate still in the live collection.
+
+        Only BSON dates count: nulls and the unparseable strings the date
+        migration leaves behind would otherwise sort first.
+        """
+        doc = await self.collection.find_one(
+            {"endDate": {"$type": "date"}}, {"_id": 0, "endDate": 1}, sort=[("endDate", ASCENDING)]
+        )
+        return doc["endDate"] if doc else None
+
+    @guarded
+    async def mark_ended(self, now: datetime) -> int:
+        """Stamp ``endedAt`` on giveaways that have passed their endDate"""
+        result = await self.collection.update_many(
+            {"endDate": {"$lte": now}, "endedAt": {"$exists": False}},
+            {"$set": {"endedAt": now}}
+        )
+        return result.modified_count
+
+    @guarded
+    async def archive_ended(self, cutoff: datetime, batch_size: int = 500) -> List[str]:
+        """Move giveaways that ended by ``cutoff`` to the archive collection.
+
+        Each batch is upserted into the archive before it is deleted here, so
+        an interrupted run leaves a duplicate rather than losing documents and
+        the next run completes it. The delete re-checks the endDate and the
+        version that was copied; anything edited meanwhile (moved back into
+        the future, or drawn) stays live and its archive copy is removed
+        again. Returns the ids that were moved.
+        """
+        archived = []
+        query = {"endDate": {"$type": "date", "$lte": cutoff}}
+        while True:
+            cursor = self.collection.find(query).sort("endDate", ASCENDING).limit(batch_size)
+            docs = await cursor.to_list(length=batch_size)
+            if not docs:
+                return archived
+            await self.archive.bulk_write(
+                [ReplaceOne({"id": doc["id"]}, doc, upsert=True) for doc in docs],
+                ordered=False
+            )
+            object_ids = [doc["_id"] for doc in docs]
+            await self.collection.bulk_write(
+                [DeleteOne({"_id": doc["_id"], "version": doc.get("version"), **query}) for doc in docs],
+                ordered=False
+            )
+            kept = set(await self.collection.distinct("id", {"_id": {"$in": object_ids}}))
+            if kept:
+                await self.archive.delete_many({"id": {"$in": list(kept)}})
+            archived.extend(doc["id"] for doc in docs if doc["id"] not in kept)
+            if len(docs) < batch_size:
+                return archived
+
+    @guarded
+    async def find_one(self, giveaway_id: str, projection: Optional[dict] = None) -> Optional[dict]:
+        return await self.collection.find_one({"id": giveaway_id}, projection)
+
+    @guarded
+    async def find_with_archive(self, giveaway_id: str, projection: Optional[dict] = None) -> Tuple[Optional[dict], bool]:
+        """Look a giveaway up live, then in the archive; also says whether it was archived"""
+        giveaway = await self.collection.find_one({"id": giveaway_id}, projection)
+        if giveaway is not None:
+            return giveaway, False
+        return await self.archive.find_one({"id": giveaway_id}, projection), True
+
+    @guarded
+    async def insert(self, giveaway_doc: dict):
+        return await self.collection.insert_one(giveaway_doc)
+
+    @guarded
+    async def insert_many(self, giveaway_docs: List[dict]) -> Tuple[int, Dict[int, str]]:
+        """Unordered bulk insert returning the inserted count and per-index errors"""
+        try:
+            result = await self.collection.insert_many(giveaway_docs, ordered=False)
+            return len(result.inserted_ids), {}
+        except BulkWriteError as e:
+            errors = {error["index"]: error["errmsg"] for error in e.details.get("writeErrors", [])}
+            return e.details.get("nInserted", 0), errors
+
+    @guarded_iter
+    async def iter_history(
+        self, projection: Optional[dict] = None, query: Optional[dict] = None, batch_size: int = 1000
+    ) -> AsyncIterator[dict]:
+        """Every giveaway matching ``query``, live then archived, fetched in batches"""
+        for collection in (self.collection, self.archive):
+            async for giveaway in collection.find(query or {}, projection, batch_size=batch_size):
+                yield giveaway
+
+    @guarded_iter
+    async def iter_all(self, projection: Optional[dict] = None, batch_size: int = 500) -> AsyncIterator[dict]:
+        """Every giveaway, oldest first, fetched in batches"""
+        cursor = self.collection.find({}, projection, batch_size=batch_size).sort(
+            [("createdAt", ASCENDING), ("id", ASCENDING)]
+        )
+        async for giveaway in cursor:
+            yield giveaway
+
+    @guarded
+    async def update(
+        self,
+        giveaway_id: str,
+        update_data: dict,
+        expected_version: Optional[int] = None,
+        projection: Optional[dict] = None,
+        archived: bool = False,
+    ) -> Optional[dict]:
+        """Apply ``update_data`` and return the updated document in one round-trip.
+
+        With ``expected_version`` the write only matches if the stored
+        version is unchanged; None is returned when nothing matched.
+        ``archived`` writes to the archive collection instead.
+        """
+        query = {"id": giveaway_id}
+        if expected_version is not None:
+            # Documents written before versioning have no field and count as 0
+            query["version"] = {"$in": [0, None]} if expected_version == 0 else expected_version
+        update = {"$set": update_data, "$inc": {"version": 1}}
+        if "endDate" in update_data:
+            # The expiry watcher stamps it again if the new endDate has passed too
+            update["$unset"] = {"endedAt": ""}
+        collection = self.archive if archived else self.collection
+        return await collection.find_one_and_update(
+            query,
+            update,
+            projection=projection,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    @guarded
+    async def delete(self, giveaway_id: str):
+        return await self.collection.delete_one({"id": giveaway_id})
+
+    @guarded
+    async def entry_counts(self) -> Dict[str, int]:
+        """Number of stored entries per giveaway id"""
+        pipeline = [{"$group": {"_id": "$giveawayId", "count": {"$sum": 1}}}]
+        return {row["_id"]: row["count"] async for row in self.entries.aggregate(pipeline)}
+
+    @guarded
+    async def entry_user_ids(self, giveaway_id: str) -> Set[str]:
+        cursor = self.entries.find({"giveawayId": giveaway_id}, {"_id": 0, "userId": 1})
+        return {entry["userId"] async for entry in cursor}
+
+    @guarded
+    async def upsert_entries(self, entries: List[dict]) -> List[dict]:
+        """Write entries idempotently and return the ones that were new.
+
+        Entries already stored, e.g. accepted by another worker, are left
+        untouched and not returned.
+        """
+        operations = [
+            UpdateOne(
+                {"giveawayId": entry["giveawayId"], "userId": entry["userId"]},
+                {"$setOnInsert": entry},
+                upsert=True,
+            )
+            for entry in entries
+        ]
+        result = await self.entries.bulk_write(operations, ordered=False)
+        return [entries[index] for index in result.upserted_ids]
+
+    @guarded_iter
+    async def iter_entrant_ids(self, giveaway_id: str, batch_size: int = 1000) -> AsyncIterator[dict]:
+        """A giveaway's entrant ids in ascending order.
+
+        The order is fixed by the unique (giveawayId, userId) index, which
+        is what lets a seeded draw be replayed.
+        """
+        cursor = self.entries.find(
+            {"giveawayId": giveaway_id}, {"_id": 0, "userId": 1}, batch_size=batch_size
+        ).sort("userId", ASCENDING)
+        async for entry in cursor:
+            yield entry
+
+    @guarded
+    async def delete_entries(self, giveaway_id: str):
+        return await self.entries.delete_many({"giveawayId": giveaway_id})
+
+    @guarded
+    async def ensure_change_bus(self, name: str, size: int):
+        """Create the capped collection workers exchange change events through"""
+        try:
+            await self.db.create_collection(name, capped=True, size=size)
+        except CollectionInvalid:
+            pass
+        return self.db[name]
+
+giveaway_repository = GiveawayRepository(MONGO_URL)
+
+class DatabaseHealthProbe:
+    """Pings the database in the background so /api/health never waits on it"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.healthy: Optional[bool] = None
+        self.latency_ms: Optional[float] = None
+        self.checked_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def probe(self):
+        started = time.perf_counter()
+        try:
+            await giveaway_repository.ping()
+            self.healthy = True
+            self.error = None
+        except Exception as e:
+            self.healthy = False
+            # Report the driver's reason rather than the generic 503 detail
+            self.error = str(e.__cause__ or e)
+        self.latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.checked_at = utcnow()
+
+    async def _run(self):
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval)
+
+    def pool_stats(self) -> dict:
+        pool = giveaway_repository.pool
+        return {
+            "maxSize": MONGO_MAX_POOL_SIZE,
+            "open": pool.open,
+            "inUse": pool.in_use,
+            "waiting": pool.waiting,
+            "saturation": round(pool.in_use / MONGO_MAX_POOL_SIZE, 4) if MONGO_MAX_POOL_SIZE else 0.0,
+        }
+
+database_probe = DatabaseHealthProbe(HEALTH_PROBE_INTERVAL_SECONDS)
+
+# Read cache
+class ReadCache:
+    """In-process TTL cache for the public read endpoints.
+
+    Entries are stamped with the cache version current when their query
+    started. ``invalidate`` bumps the version, so anything filled from data
+    read before an admin write is treated as a miss even if the write lands
+    while the query is still in flight. An entry can also be given its own
+    deadline earlier than the TTL, e.g. the next giveaway ``endDate``.
+
+    The last value stored under each key is also kept past expiry and
+    invalidation, to be served while the database is unavailable.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Any, Tuple[int, float, Any]] = {}
+        self._last_good: Dict[Any, Any] = {}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            version, deadline, value = entry
+            if version == self.version and time.monotonic() < deadline:
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key, value, version: int, expires_at: Optional[datetime] = None):
+        """Store ``value`` that was read while the cache was at ``version``"""
+        if version != self.version:
+            return
+        self._last_good.pop(key, None)
+        if len(self._last_good) >= self.max_entries:
+            self._last_good.pop(next(iter(self._last_good)))
+        self._last_good[key] = value
+        ttl = self.ttl
+        if expires_at is not None:
+            ttl = min(ttl, seconds_until(expires_at))
+        if ttl <= 0:
+            return
+        if len(self._entries) >= self.max_entries:
+            # Dicts keep insertion order, so this drops the oldest entry
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (version, time.monotonic() + ttl, value)
+
+    def last_good(self, key):
+        return self._last_good.get(key)
+
+    def invalidate(self):
+        self.version += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+read_cache = ReadCache(READ_CACHE_TTL_SECONDS)
+
+if PROMETHEUS_MULTIPROC_DIR:
+    # A scrape lands on any one worker, so it reads every worker's files.
+    # The read cache collector is per process and is left out; its
+    # counters are still on each worker's /api/health.
+    metrics_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(metrics_registry)
+else:
+    metrics_registry = REGISTRY
+    REGISTRY.register(CacheMetricsCollector())
+
+# Community stats
+class GiveawayCounters:
+    """Incrementally maintained giveaway totals behind /api/stats.
+
+    Loaded once with a single aggregation, then adjusted by the write
+    handlers and the expiry watcher, so serving stats never touches Mongo.
+    Active giveaways are tracked as id -> endDate because an edit can move
+    an endDate across "now" and the delta cannot be known from a count.
+
+    Upcoming endDates also sit in a min-heap. Edits and deletes leave their
+    old entry behind; an entry only counts while it still matches
+    ``active_ends``, and stale ones are discarded as they reach the top.
+
+    Giveaways that leave ``active_ends`` take no more entries, so the entry
+    buffer is told to drop their entrant ids.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self.total = 0
+        self.archived = 0
+        self.active_ends: Dict[str, datetime] = {}
+        self._expiries: List[Tuple[datetime, str]] = []
+
+    async def load(self):
+        total, active = await giveaway_repository.stats_snapshot(utcnow())
+        self.archived = await giveaway_repository.count_archived()
+        self.total = total
+        active_ends = {giveaway["id"]: giveaway["endDate"] for giveaway in active}
+        for giveaway_id in self.active_ends.keys() - active_ends.keys():
+            entry_buffer.ended(giveaway_id)
+        self.active_ends = active_ends
+        self._rebuild_expiries()
+        self.loaded = True
+
+    @property
+    def active(self) -> int:
+        return len(self.active_ends)
+
+    def _rebuild_expiries(self):
+        self._expiries = [(end, giveaway_id) for giveaway_id, end in self.active_ends.items()]
+        heapq.heapify(self._expiries)
+
+    def _is_current(self, entry: Tuple[datetime, str]) -> bool:
+        end, giveaway_id = entry
+        return self.active_ends.get(giveaway_id) == end
+
+    def next_end(self) -> Optional[datetime]:
+        while self._expiries and not self._is_current(self._expiries[0]):
+            heapq.heappop(self._expiries)
+        return self._expiries[0][0] if self._expiries else None
+
+    def created(self, giveaway_id: str, end_date: datetime):
+        self.total += 1
+        self.updated(giveaway_id, end_date)
+
+    def updated(self, giveaway_id: str, end_date: datetime):
+        if end_date > utcnow():
+            if self.active_ends.get(giveaway_id) != end_date:
+                self.active_ends[giveaway_id] = end_date
+                heapq.heappush(self._expiries, (end_date, giveaway_id))
+        elif self.active_ends.pop(giveaway_id, None) is not None:
+            entry_buffer.ended(giveaway_id)
+        # Keep stale entries from piling up under repeated edits
+        if len(self._expiries) > 2 * len(self.active_ends) + 64:
+            self._rebuild_expiries()
+
+    def deleted(self, giveaway_id: str):
+        self.total -= 1
+        self.active_ends.pop(giveaway_id, None)
+
+    def expire(self, now: datetime) -> List[str]:
+        """Drop giveaways that ended by ``now`` and return their ids"""
+        ended = []
+        while self._expiries and self._expiries[0][0] <= now:
+            entry = heapq.heappop(self._expiries)
+            if self._is_current(entry):
+                del self.active_ends[entry[1]]
+                entry_buffer.ended(entry[1])
+                ended.append(entry[1])
+        return ended
+
+giveaway_counters = GiveawayCounters()
+
+class MemberCountSource(ABC):
+    """Where the community member count comes from"""
+
+    @abstractmethod
+    async def fetch(self) -> int:
+        ...
+
+class StaticMemberCount(MemberCountSource):
+    def __init__(self, count: int):
+        self.count = count
+
+    async def fetch(self) -> int:
+        return self.count
+
+class FileMemberCount(MemberCountSource):
+    """Reads a bare integer or ``{"memberCount": n}`` from a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _read(self) -> int:
+        with open(self.path) as f:
+            data = json.load(f)
+        return int(data["memberCount"] if isinstance(data, dict) else data)
+
+    async def fetch(self) -> int:
+        # File reads block, and the path may be on a slow or network mount
+        return await asyncio.to_thread(self._read)
+
+class DiscordInviteMemberCount(MemberCountSource):
+    """Approximate member count of the server behind a Discord invite"""
+
+    def __init__(self, invite_code: str):
+        self.url = f"https://discord.com/api/v9/invites/{invite_code}?with_counts=true"
+
+    async def fetch(self) -> int:
+        import requests
+
+        response = await asyncio.to_thread(requests.get, self.url, timeout=10)
+        response.raise_for_status()
+        return int(response.json()["approximate_member_count"])
+
+def member_count_source_from_spec(spec: str) -> MemberCountSource:
+    kind, _, value = spec.partition(":")
+    if kind == "static":
+        return StaticMemberCount(int(value))
+    if kind == "file":
+        return FileMemberCount(value)
+    if kind == "discord":
+        return DiscordInviteMemberCount(value)
+    raise ValueError(f"Unknown member count source: {spec}")
+
+class MemberCountTracker:
+    """Keeps the last fetched member count, refreshed in the background"""
+
+    def __init__(self, source: MemberCountSource, refresh_seconds: float, default: int = 500):
+        self.source = source
+        self.refresh_seconds = refresh_seconds
+        self.count = default
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self):
+        try:
+            self.count = await self.source.fetch()
+        except Exception as e:
+            logger.warning("Failed to refresh member count, keeping %d: %s", self.count, e)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_seconds)
+
+member_count = MemberCountTracker(
+    member_count_source_from_spec(MEMBER_COUNT_SOURCE),
+    MEMBER_COUNT_REFRESH_SECONDS,
+)
+
+# Change feed
+class Subscriber:
+    """One change feed client with a bounded queue of pending events"""
+    __slots__ = ("queue", "dropped")
+
+    def __init__(self, max_queued: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.dropped = False
+
+class ChangeBroadcaster:
+    """Fans giveaway change events out to every connected stream client.
+
+    Publishing never waits on a client: each subscriber has a bounded queue,
+    and one that falls a full queue behind is dropped and left to reconnect
+    and resync, so a slow consumer cannot hold memory or stall the writers.
+    """
+
+    def __init__(self, max_queued: int):
+        self.max_queued = max_queued
+        self.sequence = 0
+        self.dropped = 0
+        self.subscribers: Set[Subscriber] = set()
+        # Set while a Mongo change stream is the source of events, in which
+        # case the write handlers leave publishing to it
+        self.external_feed = False
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.max_queued)
+        self.subscribers.add(subscriber)
+        STREAM_SUBSCRIBERS.set(len(self.subscribers))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+        STREAM_SUBSCRIBERS.set(len(self.subscribers))
+
+    def publish(self, event: dict):
+        self.sequence += 1
+        message = f"id: {self.sequence}\ndata: {orjson.dumps(event, option=orjson.OPT_UTC_Z).decode()}\n\n"
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: Subscriber):
+        self.unsubscribe(subscriber)
+        self.dropped += 1
+        subscriber.dropped = True
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+broadcaster = ChangeBroadcaster(STREAM_QUEUE_SIZE)
+
+class ChangeBus:
+    """Carries change events between worker processes.
+
+    Each worker keeps its own read cache, counters, entry counts and stream
+    subscribers, so a write handled by one worker has to reach the others.
+    Events are appended to a capped collection and every worker tails it.
+    This works without a replica set, unlike change streams. Publishing
+    goes through a queue and one writer task, so handlers never wait on it
+    and events leave in order.
+
+    A capped collection is read in insertion order, but ObjectIds from
+    different processes are not ordered. So instead of an ``_id`` range, a
+    worker writes a marker when it starts tailing and skips everything up
+    to it. If the cursor dies, events may have been missed, and the worker
+    reloads its state before tailing again.
+    """
+
+    # Computed by every worker on its own, so never sent
+    LOCAL_EVENTS = {"expire"}
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+        self.worker_id = uuid.uuid4().hex
+        self.enabled = False
+        self.collection = None
+        self.received = 0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._reload: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self.collection = await giveaway_repository.ensure_change_bus(self.name, self.size)
+        self._queue = asyncio.Queue()
+        self.enabled = True
+        self._tasks = [asyncio.create_task(self._write()), asyncio.create_task(self._tail())]
+
+    def stop(self):
+        self.enabled = False
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def publish(self, event: dict):
+        if self.enabled and event["type"] not in self.LOCAL_EVENTS:
+            self._queue.put_nowait(event)
+
+    async def _write(self):
+        while True:
+            events = [await self._queue.get()]
+            while not self._queue.empty():
+                events.append(self._queue.get_nowait())
+            try:
+                await self.collection.insert_many(
+                    [{"worker": self.worker_id, "event": event} for event in events]
+                )
+            except PyMongoError as e:
+                logger.warning("Dropped %d change bus events: %s", len(events), e)
+
+    async def _tail(self):
+        resync = False
+        while True:
+            try:
+                marker = (await self.collection.insert_one({"worker": self.worker_id, "marker": True})).inserted_id
+                if resync:
+                    await self._resync()
+                caught_up = False
+                cursor = self.collection.find({}, cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive:
+                    async for doc in cursor:
+                        if not caught_up:
+                            caught_up = doc["_id"] == marker
+                        elif doc["worker"] != self.worker_id and "event" in doc:
+                            self.received += 1
+                            self.apply(doc["event"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Change bus cursor failed, resyncing: %s", e)
+                await asyncio.sleep(1)
+            resync = True
+
+    async def _resync(self):
+        read_cache.invalidate()
+        await giveaway_counters.load()
+        await entry_buffer.load()
+        expiry_watcher.wake()
+        if not broadcaster.external_feed:
+            broadcaster.publish({"type": "resync"})
+
+    def _reload_counters(self):
+        # Archive runs report one event per giveaway; reload once per burst
+        if self._reload is None or self._reload.done():
+            async def reload():
+                await asyncio.sleep(0.1)
+                await giveaway_counters.load()
+            self._reload = asyncio.create_task(reload())
+
+    def apply(self, event: dict):
+        """Bring this worker in line with a change made by another one"""
+        event_type = event["type"]
+        if event_type == "entries":
+            entry_buffer.confirmed(event["entries"])
+            return
+        read_cache.invalidate()
+        if event_type == "create":
+            giveaway = event["giveaway"]
+            giveaway_counters.created(giveaway["id"], parse_datetime(giveaway["endDate"]))
+            expiry_watcher.wake()
+        elif event_type == "update":
+            giveaway = event["giveaway"]
+            giveaway_counters.updated(giveaway["id"], parse_datetime(giveaway["endDate"]))
+            expiry_watcher.wake()
+        elif event_type == "delete":
+            giveaway_counters.deleted(event["id"])
+            entry_buffer.forget(event["id"])
+        elif event_type in ("archive", "resync"):
+            self._reload_counters()
+        if not broadcaster.external_feed:
+            broadcaster.publish(event)
+
+change_bus = ChangeBus("change_bus", CHANGE_BUS_SIZE_BYTES)
+
+def announce(event_type: str, **data):
+    """Publish a change to this worker's stream clients and the other workers.
+
+    Local clients are left to the change stream when one is running.
+    """
+    event = {"type": event_type, **data}
+    if not broadcaster.external_feed:
+        broadcaster.publish(event)
+    change_bus.publish(event)
+
+async def watch_change_stream():
+    """Feed the broadcaster from a Mongo change stream.
+
+    Deletes only carry the Mongo ``_id``, so they are published as a
+    ``resync`` telling clients to refetch rather than as a diff.
+    """
+    try:
+        async with giveaway_repository.collection.watch(full_document="updateLookup") as stream:
+            broadcaster.external_feed = True
+            async for change in stream:
+                read_cache.invalidate()
+                operation = change["operationType"]
+                document = change.get("fullDocument")
+                if operation == "insert" and document:
+                    broadcaster.publish({"type": "create", "giveaway": giveaway_to_dict(document)})
+                elif operation in ("update", "replace") and document:
+                    broadcaster.publish({"type": "update", "giveaway": giveaway_to_dict(document)})
+                else:
+                    broadcaster.publish({"type": "resync"})
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning("Change stream stopped, falling back to in-process events: %s", e)
+    finally:
+        broadcaster.external_feed = False
+
+class ExpiryWatcher:
+    """Sweeps giveaways out of the active counters when they pass their endDate.
+
+    Sleeps until the next endDate or archive deadline rather than polling.
+    Ended giveaways get an ``expire`` event and an ``endedAt`` stamp, and
+    once they have been over for ``retention`` they are moved to the
+    archive collection with an ``archive`` event. Write handlers call
+    ``wake`` because a new or edited giveaway may end sooner.
+    """
+
+    def __init__(self, retention: timedelta, max_sleep: float = 300):
+        self.retention = retention
+        self.max_sleep = max_sleep
+        self._wake = asyncio.Event()
+        self._stopping = False
+        # Also set on start so giveaways that ended while we were down get stamped
+        self._mark_pending = True
+        self._task: Optional[asyncio.Task] = None
+        # Bumped whenever giveaways end, for results computed against the clock
+        self.generation = 0
+
+    def start(self):
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._mark_pending = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            # wait_for can swallow a cancel that races a wake-up, so the loop
+            # also checks a flag rather than relying on cancellation alone
+            self._stopping = True
+            self._wake.set()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self):
+        self._wake.set()
+
+    def sweep(self):
+        ended = giveaway_counters.expire(utcnow())
+        for giveaway_id in ended:
+            announce("expire", id=giveaway_id)
+        if ended:
+            self.generation += 1
+            # Stamping endedAt is a write, so it is left to the watcher task
+            self._mark_pending = True
+            self._wake.set()
+
+    async def archive(self):
+        archived = await giveaway_repository.archive_ended(utcnow() - self.retention)
+        if archived:
+            logger.info("Archived %d ended giveaways", len(archived))
+            read_cache.invalidate()
+            # Other workers may be archiving the same giveaways, so recount
+            # rather than trust the length of our own batch
+            await giveaway_counters.load()
+            for giveaway_id in archived:
+                announce("archive", id=giveaway_id)
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                if not giveaway_counters.loaded:
+                    await giveaway_counters.load()
+                if self._mark_pending:
+                    self._mark_pending = False
+                    await giveaway_repository.mark_ended(utcnow())
+                oldest_end = await giveaway_repository.oldest_end()
+                archive_due = oldest_end + self.retention if oldest_end is not None else None
+                if archive_due is not None and archive_due <= utcnow():
+                    await self.archive()
+                    continue
+                deadlines = [d for d in (giveaway_counters.next_end(), archive_due) if d is not None]
+                timeout = self.max_sleep
+                if deadlines:
+                    timeout = max(0.0, min(timeout, seconds_until(min(deadlines))))
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Expiry watcher error: %s", e)
+                await asyncio.sleep(5)
+
+expiry_watcher = ExpiryWatcher(timedelta(days=ARCHIVE_RETENTION_DAYS))
+
+# Giveaway entries
+class EntryBuffer:
+    """Accepts giveaway entries in memory and writes them to MongoDB in batches.
+
+    Each giveaway's entrant ids are loaded once, on its first entry after
+    startup, and then deduplicate repeat clicks without a query. New
+    entries are queued and flushed as one unordered bulk upsert when
+    ``flush_size`` are waiting or ``flush_interval`` has passed, so a burst
+    costs a handful of round-trips rather than one per click. The unique
+    (giveawayId, userId) index keeps retried flushes idempotent.
+    """
+
+    def __init__(self, flush_size: int, flush_interval: float):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        # Entries known to be stored, by any worker, plus our own unflushed ones
+        self.counts: Dict[str, int] = {}
+        self.pending_counts: Dict[str, int] = {}
+        self._entrants: Dict[str, Set[str]] = {}
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._pending: List[dict] = []
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def load(self):
+        self.counts = await giveaway_repository.entry_counts()
+        self._entrants = {}
+
+    def start(self):
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Whatever is still queued gets one last attempt before the client closes
+        if self._pending:
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Dropping %d unwritten giveaway entries: %s", len(self._pending), e)
+
+    async def _entrants_for(self, giveaway_id: str) -> Set[str]:
+        entrants = self._entrants.get(giveaway_id)
+        if entrants is not None:
+            return entrants
+        # Concurrent first entries share one load instead of each querying
+        loading = self._loading.get(giveaway_id)
+        if loading is None:
+            loading = asyncio.ensure_future(giveaway_repository.entry_user_ids(giveaway_id))
+            self._loading[giveaway_id] = loading
+            loading.add_done_callback(lambda _: self._loading.pop(giveaway_id, None))
+        stored = await asyncio.shield(loading)
+        entrants = self._entrants.get(giveaway_id)
+        if entrants is None:
+            entrants = stored
+            # Not kept if the giveaway ended while loading; ended() has been and gone
+            if giveaway_id in giveaway_counters.active_ends:
+                self._entrants[giveaway_id] = entrants
+        return entrants
+
+    def count(self, giveaway_id: str) -> int:
+        return self.counts.get(giveaway_id, 0) + self.pending_counts.get(giveaway_id, 0)
+
+    async def add(self, giveaway_id: str, user_id: str) -> bool:
+        """Queue an entry; returns False if the user had already entered"""
+        entrants = await self._entrants_for(giveaway_id)
+        if user_id in entrants:
+            return False
+        entrants.add(user_id)
+        self.pending_counts[giveaway_id] = self.pending_counts.get(giveaway_id, 0) + 1
+        self._pending.append({"giveawayId": giveaway_id, "userId": user_id, "createdAt": utcnow()})
+        ENTRIES_PENDING.set(len(self._pending))
+        if len(self._pending) >= self.flush_size:
+            self._wake.set()
+        return True
+
+    def ended(self, giveaway_id: str):
+        """Drop an ended giveaway's entrant ids; its count stays for stats"""
+        self._entrants.pop(giveaway_id, None)
+
+    def forget(self, giveaway_id: str):
+        """Drop a deleted giveaway's entrants, count and queued entries"""
+        self.counts.pop(giveaway_id, None)
+        self.pending_counts.pop(giveaway_id, None)
+        self._entrants.pop(giveaway_id, None)
+        self._pending = [entry for entry in self._pending if entry["giveawayId"] != giveaway_id]
+        ENTRIES_PENDING.set(len(self._pending))
+
+    async def flush(self):
+        while self._pending:
+            batch = self._pending[:self.flush_size]
+            del self._pending[:len(batch)]
+            try:
+                stored = await giveaway_repository.upsert_entries(batch)
+            except Exception:
+                # Put the batch back in front so a retry keeps the original order
+                self._pending[:0] = batch
+                raise
+            finally:
+                ENTRIES_PENDING.set(len(self._pending))
+            ENTRY_FLUSH_SIZE_HISTOGRAM.observe(len(batch))
+            for entry in batch:
+                giveaway_id = entry["giveawayId"]
+                if giveaway_id in self.pending_counts:
+                    self.pending_counts[giveaway_id] -= 1
+                    if not self.pending_counts[giveaway_id]:
+                        del self.pending_counts[giveaway_id]
+            # Entries another worker stored first are not counted twice
+            by_giveaway: Dict[str, List[str]] = {}
+            for entry in stored:
+                by_giveaway.setdefault(entry["giveawayId"], []).append(entry["userId"])
+            self.confirmed(by_giveaway)
+            if by_giveaway:
+                change_bus.publish({"type": "entries", "entries": by_giveaway})
+
+    def confirmed(self, entries: Dict[str, List[str]]):
+        """Count entries that have been stored, by this or another worker"""
+        for giveaway_id, user_ids in entries.items():
+            self.counts[giveaway_id] = self.counts.get(giveaway_id, 0) + len(user_ids)
+            entrants = self._entrants.get(giveaway_id)
+            if entrants is not None:
+                entrants.update(user_ids)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("Failed to flush %d giveaway entries, will retry: %s", len(self._pending), e)
+                await asyncio.sleep(self.flush_interval)
+
+entry_buffer = EntryBuffer(ENTRY_FLUSH_SIZE, ENTRY_FLUSH_INTERVAL_SECONDS)
+change_stream_task: Optional[asyncio.Task] = None
+loop_lag_task: Optional[asyncio.Task] = None
+prepare_task: Optional[asyncio.Task] = None
+
+# Rate limiting and request coalescing
+class TokenBucketLimiter:
+    """Per-client token buckets, one set per budget.
+
+    Each (budget, client) bucket holds up to ``burst`` tokens, refills at
+    ``rate`` per second and pays one token per request. Buckets are created
+    on first use. Ones that have refilled completely are indistinguishable
+    from new and get pruned once there are many; if that is not enough the
+    oldest go too, so a flood of new clients costs one scan per tenth of
+    ``max_buckets`` rather than one per request. Limits apply per worker
+    process.
+    """
+
+    def __init__(self, budgets: Dict[str, Tuple[float, float]], max_buckets: int = 100_000):
+        self.enabled = True
+        self.budgets = budgets
+        self.max_buckets = max_buckets
+        self._buckets: Dict[Tuple[str, str], List[float]] = {}
+
+    def acquire(self, budget: str, client: str) -> float:
+        """Take a token; returns 0 if allowed, else seconds until one is available"""
+        rate, burst = self.budgets[budget]
+        now = time.monotonic()
+        bucket = self._buckets.get((budget, client))
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                self._prune(now)
+            bucket = self._buckets[(budget, client)] = [burst, now]
+        tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / rate
+
+    def _prune(self, now: float):
+        for key, (tokens, updated) in list(self._buckets.items()):
+            rate, burst = self.budgets[key[0]]
+            if tokens + (now - updated) * rate >= burst:
+                del self._buckets[key]
+        excess = len(self._buckets) - self.max_buckets * 9 // 10
+        if excess > 0:
+            # Dicts keep insertion order, so these are the longest-lived buckets
+            for key in list(itertools.islice(self._buckets, excess)):
+                del self._buckets[key]
+
+rate_limiter = TokenBucketLimiter({
+    "public": (RATE_LIMIT_PUBLIC_PER_SECOND, RATE_LIMIT_PUBLIC_BURST),
+    "admin": (RATE_LIMIT_ADMIN_PER_SECOND, RATE_LIMIT_ADMIN_BURST),
+    "login": (RATE_LIMIT_LOGIN_PER_MINUTE / 60, RATE_LIMIT_LOGIN_BURST),
+})
+rate_limiter.enabled = RATE_LIMIT_ENABLED
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 with Retry-After once a client's budget is spent.
+
+    Login gets its own small budget against password guessing, the other
+    admin routes a moderate one, and every other /api request shares the
+    public budget. Static files and /metrics are not limited.
+    """
+
+    def __init__(self, app, limiter: TokenBucketLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    @staticmethod
+    def budget_for(path: str) -> Optional[str]:
+        if path == "/api/admin/login":
+            return "login"
+        if path.startswith("/api/admin/"):
+            return "admin"
+        if path.startswith("/api/"):
+            return "public"
+        return None
+
+    @staticmethod
+    def client_key(scope, trusted_proxies: int = 0) -> str:
+        """The address the outermost trusted proxy saw the request come from.
+
+        Each proxy appends its peer to X-Forwarded-For, so only the last
+        ``trusted_proxies`` entries were written by our own infrastructure;
+        anything left of them is whatever the client chose to send.
+        """
+        if trusted_proxies > 0:
+            hops = [hop.strip() for hop in ",".join(Headers(scope=scope).getlist("x-forwarded-for")).split(",")]
+            if len(hops) >= trusted_proxies and hops[-trusted_proxies]:
+                return hops[-trusted_proxies]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope, receive, send):
+        budget = self.budget_for(scope["path"]) if scope["type"] == "http" else None
+        if budget is None or not self.limiter.enabled:
+            await self.app(scope, receive, send)
+            return
+        retry_after = self.limiter.acquire(budget, self.client_key(scope, RATE_LIMIT_TRUSTED_PROXIES))
+        if not retry_after:
+            await self.app(scope, receive, send)
+            return
+        RATE_LIMITED.labels(budget).inc()
+        response = Response(
+            orjson.dumps({"detail": "Too many requests"}),
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            media_type="application/json",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+        await response(scope, receive, send)
+
+class SingleFlight:
+    """Lets concurrent identical reads share one in-flight query.
+
+    The first caller for a key starts the work as its own task; callers
+    arriving before it finishes await the same task. A caller that
+    disconnects does not cancel the work for the others.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[Any, asyncio.Future] = {}
+
+    async def run(self, key, fill):
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(fill())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            COALESCED_READS.labels(self.name).inc()
+        return await asyncio.shield(flight)
+
+read_flights = SingleFlight("read")
+
+# Frontend static files
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+    """Content codings the client accepts, ignoring any with q=0"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+class FrontendFiles(StaticFiles):
+    """Serves the React build, preferring precompressed variants.
 
-# MongoDB connection
-client = MongoClient(MONGO_URL)
-db = client.rbc_community
-giveaways_collection = db.giveaways
+    ``.br``/``.gz`` siblings written at build time by
+    ``frontend/scripts/precompress.js`` are picked by Accept-Encoding.
+    Content-hashed files never change, so they are cached as immutable;
+    everything else (notably index.html) is revalidated. Unknown paths
+    outside ``api/`` and ``static/`` fall back to index.html for
+    client-side routing.
+    """
+
+    ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+    HASHED_ASSET = re.compile(r"(^|/)static/.+\.[0-9a-f]{8}\.")
+    IMMUTABLE = "public, max-age=31536000, immutable"
+
+    def __init__(self, directory: str):
+        super().__init__(directory=directory, html=True, check_dir=False)
+        self.root = os.path.realpath(directory)
+        # The build directory does not change at runtime, so variant lookups are memoized
+        self._variants: Dict[Tuple[str, str], Optional[Tuple[str, os.stat_result]]] = {}
+
+    async def get_response(self, path: str, scope) -> Response:
+        try:
+            return await super().get_response(path, scope)
+        except StarletteHTTPException as e:
+            if e.status_code != 404 or path.startswith(("api/", "static/")):
+                raise
+        return await super().get_response("index.html", scope)
+
+    def _variant(self, full_path: str, suffix: str) -> Optional[Tuple[str, os.stat_result]]:
+        key = (full_path, suffix)
+        if key not in self._variants:
+            try:
+                self._variants[key] = (full_path + suffix, os.stat(full_path + suffix))
+            except OSError:
+                self._variants[key] = None
+        return self._variants[key]
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        full_path = str(full_path)
+        request_headers = Headers(scope=scope)
+        relative_path = os.path.relpath(full_path, self.root).replace(os.sep, "/")
+        headers = {
+            "Cache-Control": self.IMMUTABLE if self.HASHED_ASSET.search(relative_path) else "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in self.ENCODINGS:
+            variant = self._variant(full_path, suffix) if encoding in accepted else None
+            if variant is not None:
+                full_path, stat_result = variant
+                headers["Content-Encoding"] = encoding
+                break
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=stat_result,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+class ApiGZipMiddleware(GZipMiddleware):
+    """Compresses /api responses above ``minimum_size``.
+
+    Static assets already arrive precompressed, and the change feed is left
+    alone because gzip would buffer its events.
+    """
+
+    EXCLUDED_PATHS = {"/api/giveaways/stream"}
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["path"].startswith("/api/")
+            and scope["path"] not in self.EXCLUDED_PATHS
+        ):
+            await super().__call__(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+frontend_files = FrontendFiles(FRONTEND_BUILD_DIR) if SERVE_FRONTEND else None
 
 # FastAPI app
 app = FastAPI(title="RBC Community API", version="1.0.0")
 
+# Inside CORS, so browsers can read 429 responses
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -26,8 +1806,107 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Giveaway-Version", "Retry-After"],
 )
 
+app.add_middleware(ApiGZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=6)
+app.add_middleware(MetricsMiddleware)
+
+async def run_migration(name: str, migrate, message: str):
+    """Run a one-off migration unless an earlier startup recorded it as done.
+
+    Both migrations scan the whole collection, and every worker prepares the
+    database on startup. Current code never writes the legacy shapes, so a
+    completed run never needs repeating; workers racing on the first deploy
+    just apply the same idempotent updates.
+    """
+    if await giveaway_repository.migration_done(name):
+        return
+    changed = await migrate()
+    if changed:
+        logger.info(message, changed)
+    await giveaway_repository.mark_migration_done(name)
+
+async def prepare_collection():
+    """Indexes and migrations for the giveaways collection"""
+    await giveaway_repository.ensure_indexes()
+    await run_migration("dates-v1", giveaway_repository.migrate_dates, "Migrated %d giveaways to BSON dates")
+    await run_migration("versions-v1", giveaway_repository.backfill_versions, "Added a version to %d giveaways")
+
+async def start_change_stream():
+    global change_stream_task
+    if await giveaway_repository.is_replica_set():
+        change_stream_task = asyncio.create_task(watch_change_stream())
+
+async def start_change_bus():
+    if CHANGE_BUS in ('1', 'true', 'yes') or (CHANGE_BUS == 'auto' and WEB_CONCURRENCY > 1):
+        await change_bus.start()
+
+# Each step is independent of the others failing, and retried on its own
+DATABASE_PREPARE_STEPS = [
+    ("prepare giveaways collection", prepare_collection),
+    ("load giveaway counters", giveaway_counters.load),
+    ("load giveaway entry counts", entry_buffer.load),
+    ("detect replica set for the change stream", start_change_stream),
+    ("start the change bus, workers will drift apart until it starts", start_change_bus),
+]
+
+async def prepare_database(steps=DATABASE_PREPARE_STEPS, retry: bool = False, max_delay: float = 60):
+    """Indexes, migrations and the in-memory state loaded from the database.
+
+    Returns the steps that failed. With ``retry`` those are run again with
+    exponential backoff until every one has succeeded.
+    """
+    delay = 1.0
+    while True:
+        failed = []
+        for description, step in steps:
+            try:
+                await step()
+            except Exception as e:
+                logger.error("Could not %s: %s", description, e)
+                failed.append((description, step))
+        if not failed or not retry:
+            return failed
+        steps = failed
+        logger.info("Retrying %d database preparation steps in %.0fs", len(steps), delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+@app.on_event("startup")
+async def startup():
+    await giveaway_repository.connect()
+    global prepare_task
+    pending = await prepare_database() if MONGO_CONNECT_ON_STARTUP else DATABASE_PREPARE_STEPS
+    if pending:
+        # Serve (from memory and 503s) straight away and catch up once Mongo answers
+        prepare_task = asyncio.create_task(prepare_database(pending, retry=True))
+    entry_buffer.start()
+    member_count.start()
+    expiry_watcher.start()
+    database_probe.start()
+
+    global loop_lag_task
+    loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
+
+@app.on_event("shutdown")
+async def shutdown():
+    if loop_lag_task is not None:
+        loop_lag_task.cancel()
+    if prepare_task is not None:
+        prepare_task.cancel()
+    database_probe.stop()
+    await expiry_watcher.stop()
+    await entry_buffer.stop()
+    change_bus.stop()
+    member_count.stop()
+    if change_stream_task is not None:
+        change_stream_task.cancel()
+    giveaway_repository.close()
+    if PROMETHEUS_MULTIPROC_DIR:
+        # Drops this worker from the live gauges
+        multiprocess.mark_process_dead(os.getpid())
+
 # Pydantic models
 class Giveaway(BaseModel):
     title: str
@@ -44,95 +1923,767 @@ class GiveawayResponse(BaseModel):
     endDate: str
     entryRequirement: str
     createdAt: str
+    version: int = 0
+
+class GiveawayListItem(BaseModel):
+    """Giveaway as returned by the list endpoint, where ``fields=`` may trim it"""
+    id: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    prize: Optional[str] = None
+    endDate: Optional[str] = None
+    entryRequirement: Optional[str] = None
+    createdAt: Optional[str] = None
+    version: Optional[int] = None
+
+class BulkGiveaway(Giveaway):
+    """One NDJSON row of a bulk import; id/createdAt are kept when migrating"""
+    id: Optional[str] = None
+    createdAt: Optional[str] = None
+
+class GiveawayEntry(BaseModel):
+    userId: str = Field(..., min_length=1, max_length=64)
 
 class AdminLogin(BaseModel):
     password: str
 
-# Admin password (in production, this should be properly secured)
-ADMIN_PASSWORD = "Rbcadminpass2025"
+# Admin authentication
+admin_password_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"])
+
+if not ADMIN_PASSWORD_HASH:
+    if not ADMIN_DEV_DEFAULTS:
+        raise RuntimeError(
+            "ADMIN_PASSWORD_HASH is not set; generate one with "
+            "python -c \"from passlib.hash import pbkdf2_sha256; print(pbkdf2_sha256.hash('<password>'))\" "
+            "or set ADMIN_DEV_DEFAULTS=true for local development"
+        )
+    logger.warning("ADMIN_PASSWORD_HASH is not set, using the development admin password")
+    ADMIN_PASSWORD_HASH = admin_password_context.hash("Rbcadminpass2025")
+
+if not ADMIN_TOKEN_SECRET:
+    # A generated secret is private to this process, so every other worker
+    # would reject the tokens it issues
+    if not ADMIN_DEV_DEFAULTS or WEB_CONCURRENCY > 1:
+        raise RuntimeError(
+            "ADMIN_TOKEN_SECRET is not set; it must be shared by every worker "
+            "(ADMIN_DEV_DEFAULTS=true allows a generated one with a single worker)"
+        )
+    logger.warning("ADMIN_TOKEN_SECRET is not set, admin tokens will not survive a restart")
+    ADMIN_TOKEN_SECRET = secrets.token_urlsafe(32)
+
+ADMIN_TOKEN_ALGORITHM = "HS256"
+admin_bearer = HTTPBearer(auto_error=False)
+
+def issue_admin_token() -> str:
+    now = utcnow()
+    claims = {"sub": "admin", "iat": now, "exp": now + timedelta(seconds=ADMIN_TOKEN_TTL_SECONDS)}
+    return jwt.encode(claims, ADMIN_TOKEN_SECRET, algorithm=ADMIN_TOKEN_ALGORITHM)
+
+async def require_admin(credentials: Optional[HTTPAuthorizationCredentials] = Depends(admin_bearer)):
+    """Dependency guarding admin routes with a bearer token from /api/admin/login.
+
+    Verification is a signature and expiry check only, so it costs no
+    database round-trip and no password hashing.
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Admin authentication required",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    try:
+        jwt.decode(
+            credentials.credentials,
+            ADMIN_TOKEN_SECRET,
+            algorithms=[ADMIN_TOKEN_ALGORITHM],
+            options={"require": ["exp", "sub"]},
+        )
+    except jwt.InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired admin token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
 
 # Helper functions
-def giveaway_to_dict(giveaway_doc):
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def parse_datetime(value: str) -> datetime:
+    """Parse an ISO-8601 string into an aware UTC datetime.
+
+    Values without an offset (e.g. from a ``datetime-local`` input) are
+    treated as UTC. Raises ValueError for malformed input.
+    """
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def seconds_until(moment: datetime) -> float:
+    return (moment - utcnow()).total_seconds()
+
+def format_datetime(value) -> str:
+    """Render a stored date as an ISO-8601 UTC string with a ``Z`` suffix"""
+    if isinstance(value, str):
+        return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+GIVEAWAY_FIELDS = ("id", "title", "description", "prize", "endDate", "entryRequirement", "createdAt", "version")
+DATE_FIELDS = {"endDate", "createdAt"}
+
+def api_projection(fields=GIVEAWAY_FIELDS) -> dict:
+    """Mongo projection returning exactly the given API fields"""
+    projection = {field: 1 for field in fields}
+    projection["_id"] = 0
+    return projection
+
+GIVEAWAY_PROJECTION = api_projection()
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def giveaway_to_dict(giveaway_doc, fields=GIVEAWAY_FIELDS):
     """Convert MongoDB document to dictionary for API response"""
+    result = {}
+    for field in fields:
+        if field == "version":
+            # Documents written before versioning have no field
+            result[field] = giveaway_doc.get("version", 0)
+            continue
+        value = giveaway_doc[field]
+        result[field] = format_datetime(value) if field in DATE_FIELDS else value
+    return result
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """Expected version from an If-Match header; None means unconditional.
+
+    The tag is the giveaway's ``version`` (also sent as X-Giveaway-Version),
+    not the body-hash ETag of the read endpoints. ``W/"3"`` is read as 3.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    try:
+        return int(tag.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="If-Match must be a giveaway version"
+        )
+
+class RenderedBody:
+    """A serialized JSON response body and its weak ETag.
+
+    The tag is weak because ApiGZipMiddleware passes it through unchanged
+    on the gzipped representation, and RFC 9110 only lets two encodings of
+    the same body share a weak validator.
+
+    Rendering happens once when a cache entry is filled; cache hits and
+    ``304 Not Modified`` answers reuse the bytes and tag as they are.
+
+    Read paths hand this the projected Mongo documents directly: orjson
+    writes the stored UTC datetimes in the same ISO form as
+    ``format_datetime``, so there is no per-document ``giveaway_to_dict``
+    pass and no pydantic re-validation of data we just read ourselves.
+    """
+    __slots__ = ("body", "etag", "headers")
+
+    def __init__(self, payload, headers: Optional[Dict[str, str]] = None):
+        self.body = orjson.dumps(payload, option=orjson.OPT_UTC_Z)
+        self.etag = 'W/"' + hashlib.blake2b(self.body, digest_size=16).hexdigest() + '"'
+        self.headers = headers or {}
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against ``etag`` (RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def conditional_response(
+    request: Request, rendered: RenderedBody, extra_headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Answer 304 when the client already holds ``rendered``, else send it"""
+    headers = {"ETag": rendered.etag, "Cache-Control": "no-cache", **rendered.headers, **(extra_headers or {})}
+    if etag_matches(request.headers.get("if-none-match"), rendered.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(rendered.body, media_type="application/json", headers=headers)
+
+def stale_response(request: Request, cache_key, error: DatabaseUnavailable) -> Response:
+    """Serve the last good copy of a read while the database is unavailable"""
+    rendered = read_cache.last_good(cache_key)
+    if rendered is None:
+        raise error
+    return conditional_response(request, rendered, {"X-Served-Stale": "true"})
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Validate a comma separated ``fields=`` value; ``id`` is always included"""
+    if not fields:
+        return GIVEAWAY_FIELDS
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(GIVEAWAY_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    requested.add("id")
+    return tuple(field for field in GIVEAWAY_FIELDS if field in requested)
+
+DRAW_ALGORITHM = "reservoir-r/userId-asc/python-random-v2"
+MAX_DRAW_WINNERS = 100
+
+async def draw_winners(giveaway_id: str, winners: int, seed: str) -> Tuple[List[str], int]:
+    """Pick ``winners`` distinct entrants uniformly at random.
+
+    Reservoir sampling (Algorithm R) over the entrant cursor keeps memory at
+    O(winners) however many entries there are. The RNG is seeded with
+    ``seed`` and entrants arrive in a fixed order, so the same seed over the
+    same entries always gives the same winners. ``$sample`` would be cheaper
+    but cannot be replayed. Returns the winners and the number of entries.
+    """
+    rng = random.Random(seed)
+    reservoir: List[str] = []
+    seen = 0
+    async for entry in giveaway_repository.iter_entrant_ids(giveaway_id):
+        if seen < winners:
+            reservoir.append(entry["userId"])
+        else:
+            slot = rng.randrange(seen + 1)
+            if slot < winners:
+                reservoir[slot] = entry["userId"]
+        seen += 1
+    return reservoir, seen
+
+def parse_include(include: Optional[str]) -> bool:
+    """Validate ``include=``; returns whether archived giveaways were asked for"""
+    if not include:
+        return False
+    requested = {value.strip() for value in include.split(",") if value.strip()}
+    unknown = requested.difference({"archived"})
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include values: {', '.join(sorted(unknown))}"
+        )
+    return "archived" in requested
+
+async def iter_ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """Yield (line number, line) from a streamed NDJSON body, skipping blank lines.
+
+    Over-long lines are yielded truncated to an empty value so the caller
+    reports them as errors without ever buffering them whole.
+    """
+    buffer = b""
+    line_number = 0
+    oversized = False
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            # A long line can also arrive complete within a single chunk
+            if oversized or len(line) > BULK_MAX_LINE_BYTES:
+                oversized = False
+                yield line_number, b""
+            elif line.strip():
+                yield line_number, line
+        if len(buffer) > BULK_MAX_LINE_BYTES:
+            oversized = True
+            buffer = b""
+    if oversized or buffer.strip():
+        yield line_number + 1, b"" if oversized else buffer
+
+def bulk_row_to_doc(line: bytes) -> dict:
+    """Validate one import row; raises ValueError with a readable message"""
+    if not line:
+        raise ValueError("Line is empty or too long")
+    try:
+        row = BulkGiveaway.model_validate_json(line)
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+            for error in e.errors()
+        ))
+    try:
+        end_date = parse_datetime(row.endDate)
+        created_at = parse_datetime(row.createdAt) if row.createdAt else utcnow()
+    except ValueError:
+        raise ValueError("Invalid date format")
+    return {
+        "id": row.id or str(uuid.uuid4()),
+        "title": row.title,
+        "description": row.description,
+        "prize": row.prize,
+        "endDate": end_date,
+        "entryRequirement": row.entryRequirement,
+        "createdAt": created_at,
+        "version": 0
+    }
+
+def encode_cursor(giveaway_doc) -> str:
+    """Build an opaque keyset cursor pointing just past ``giveaway_doc``"""
+    payload = json.dumps([format_datetime(giveaway_doc["createdAt"]), giveaway_doc["id"]])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, giveaway_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(created_at, str):
+            raise TypeError("cursor timestamp must be a string")
+        return parse_datetime(created_at), str(giveaway_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def encode_search_cursor(giveaway_doc, ranked: bool) -> str:
+    """Keyset cursor for search results, sorted by relevance or by endDate"""
+    if ranked:
+        payload = ["score", giveaway_doc["score"], giveaway_doc["id"]]
+    else:
+        payload = ["endDate", format_datetime(giveaway_doc["endDate"]), giveaway_doc["id"]]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+def decode_search_cursor(cursor: str, ranked: bool) -> Tuple[Any, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, value, giveaway_id = json.loads(base64.urlsafe_b64decode(padded))
+        if ranked and kind == "score" and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value), str(giveaway_id)
+        if not ranked and kind == "endDate" and isinstance(value, str):
+            return parse_datetime(value), str(giveaway_id)
+    except (ValueError, TypeError):
+        pass
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+def parse_date_filter(value: Optional[str], name: str) -> Optional[datetime]:
+    if value is None:
+        return None
+    try:
+        return parse_datetime(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid date format for {name}"
+        )
+
+# Analytics
+ANALYTICS_BUCKETS = {"day": "D", "week": "W-MON", "month": "MS"}
+# Upper edges, in hours, of the giveaway duration histogram
+DURATION_BIN_EDGES_HOURS = [0, 1, 6, 24, 72, 168, 336, 720, np.inf]
+
+def summarize(values: np.ndarray) -> dict:
+    if not len(values):
+        return {"count": 0, "mean": None, "min": None, "p50": None, "p90": None, "p99": None, "max": None}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "count": int(len(values)),
+        "mean": round(float(values.mean()), 2),
+        "min": round(float(values.min()), 2),
+        "p50": round(float(p50), 2),
+        "p90": round(float(p90), 2),
+        "p99": round(float(p99), 2),
+        "max": round(float(values.max()), 2),
+    }
+
+def compute_analytics(
+    created: np.ndarray, ends: np.ndarray, entries: np.ndarray, bucket: str, now: datetime
+) -> dict:
+    """Giveaway history statistics from columnar arrays.
+
+    ``created`` and ``ends`` are UTC ``datetime64[ms]`` arrays and
+    ``entries`` the entry count per giveaway, all in the same order.
+    Everything is computed with whole-array operations; nothing loops in
+    Python per giveaway.
+    """
+    frequency = ANALYTICS_BUCKETS[bucket]
+    now64 = np.datetime64(now.replace(tzinfo=None), "ms")
+    ones = np.ones(len(created), dtype=np.int64)
+    # Weekly bins default to closed and labelled on the right, i.e. on the
+    # Monday that ends them; every bucket is reported by its start instead
+    resample = {"rule": frequency, "closed": "left", "label": "left"}
+    created_rate = pd.Series(ones, index=pd.DatetimeIndex(created)).resample(**resample).sum()
+    ended = ends <= now64
+    ended_rate = pd.Series(ones[ended], index=pd.DatetimeIndex(ends[ended])).resample(**resample).sum()
+    rates = pd.concat({"created": created_rate, "ended": ended_rate}, axis=1).fillna(0).astype(np.int64)
+
+    duration_hours = (ends - created) / np.timedelta64(1, "h")
+    histogram, _ = np.histogram(duration_hours, bins=DURATION_BIN_EDGES_HOURS)
     return {
-        "id": giveaway_doc["id"],
-        "title": giveaway_doc["title"],
-        "description": giveaway_doc["description"],
-        "prize": giveaway_doc["prize"],
-        "endDate": giveaway_doc["endDate"],
-        "entryRequirement": giveaway_doc["entryRequirement"],
-        "createdAt": giveaway_doc["createdAt"]
+        "bucket": bucket,
+        "giveaways": int(len(created)),
+        "active": int((~ended).sum()),
+        "rates": [
+            {"start": start.strftime("%Y-%m-%dT%H:%M:%SZ"), "created": int(row.created), "ended": int(row.ended)}
+            for start, row in zip(rates.index, rates.itertuples(index=False))
+        ],
+        "durationHours": {
+            **summarize(duration_hours),
+            "histogram": [
+                {"upToHours": None if np.isinf(edge) else edge, "giveaways": int(count)}
+                for edge, count in zip(DURATION_BIN_EDGES_HOURS[1:], histogram)
+            ],
+        },
+        "entriesPerGiveaway": {**summarize(entries), "total": int(entries.sum())},
     }
 
+class AnalyticsMemo:
+    """Keeps the last rendered analytics per bucket, keyed by data version.
+
+    The version is the read cache version, bumped by every giveaway write
+    here or on another worker, the expiry generation, since ``active`` and
+    ``ended`` depend on the clock, plus the stored entry total. Repeat
+    dashboard loads therefore reuse the rendered body until something
+    changes.
+    """
+
+    def __init__(self):
+        self._results: Dict[str, Tuple[Tuple[int, int, int], RenderedBody]] = {}
+
+    @staticmethod
+    def data_version() -> Tuple[int, int, int]:
+        return read_cache.version, expiry_watcher.generation, sum(entry_buffer.counts.values())
+
+    def get(self, bucket: str) -> Optional[RenderedBody]:
+        memo = self._results.get(bucket)
+        if memo is not None and memo[0] == self.data_version():
+            return memo[1]
+        return None
+
+    def set(self, bucket: str, version: Tuple[int, int, int], rendered: RenderedBody):
+        self._results[bucket] = (version, rendered)
+
+analytics_memo = AnalyticsMemo()
+
+async def load_analytics_columns() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Read creation/end dates and entry counts into parallel arrays.
+
+    Rows whose dates the migration could not parse are left out.
+    """
+    created, ends, entries = [], [], []
+    projection = {"_id": 0, "id": 1, "createdAt": 1, "endDate": 1}
+    dated = {"createdAt": {"$type": "date"}, "endDate": {"$type": "date"}}
+    async for giveaway in giveaway_repository.iter_history(projection, dated):
+        created.append(giveaway["createdAt"].replace(tzinfo=None))
+        ends.append(giveaway["endDate"].replace(tzinfo=None))
+        entries.append(entry_buffer.counts.get(giveaway["id"], 0))
+    return (
+        np.array(created, dtype="datetime64[ms]"),
+        np.array(ends, dtype="datetime64[ms]"),
+        np.array(entries, dtype=np.int64),
+    )
+
 # API Routes
 
 @app.get("/")
-async def root():
+async def root(request: Request):
+    if frontend_files is not None:
+        return await frontend_files.get_response(".", request.scope)
     return {"message": "RBC Community API is running! 🐅"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    if WEB_CONCURRENCY > 1 and not PROMETHEUS_MULTIPROC_DIR:
+        # Each scrape would see one random worker's counters
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Metrics need PROMETHEUS_MULTIPROC_DIR when running more than one worker"
+        )
+    return Response(generate_latest(metrics_registry), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/api/health")
 async def health_check():
-    try:
-        # Test database connection
-        db.command('ping')
-        return {
-            "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
-            "database": "connected"
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "timestamp": datetime.now().isoformat(),
-            "database": "disconnected",
-            "error": str(e)
-        }
+    """Report the latest background database probe, pool usage and cache stats"""
+    probe = database_probe
+    if probe.healthy is None:
+        database = "unknown"
+    else:
+        database = "connected" if probe.healthy else "disconnected"
+    health = {
+        "status": "healthy" if probe.healthy and giveaway_repository.breaker.state == "closed" else "unhealthy",
+        "timestamp": utcnow().isoformat(),
+        "database": database,
+        "databaseLatencyMs": probe.latency_ms,
+        "checkedAt": probe.checked_at.isoformat() if probe.checked_at else None,
+        "circuit": giveaway_repository.breaker.state,
+        "pool": probe.pool_stats(),
+        "cache": read_cache.stats()
+    }
+    if probe.error:
+        health["error"] = probe.error
+    return health
+
+@app.get(
+    "/api/giveaways",
+    response_model=List[GiveawayListItem],
+    response_model_exclude_unset=True,
+)
+async def get_giveaways(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+):
+    """Get a page of giveaways, newest first.
+
+    Pass the ``X-Next-Cursor`` response header back as ``after`` to fetch
+    the following page; the header is absent on the last page. Responses
+    carry an ETag and honour ``If-None-Match``. ``include=archived`` also
+    returns giveaways that have been moved to the archive.
+    """
+    selected = parse_fields(fields)
+    include_archived = parse_include(include)
+    cursor = decode_cursor(after) if after else None
+    cache_key = ("giveaways", limit, after, selected, include_archived)
+    cached = read_cache.get(cache_key)
+    if cached is None:
+        version = read_cache.version
+
+        async def fill() -> RenderedBody:
+            # createdAt is always fetched because the next cursor is built from it
+            projection = api_projection(selected + ("createdAt",))
+            giveaways = await giveaway_repository.list_page(limit + 1, cursor, projection, include_archived)
+            headers = {}
+            if len(giveaways) > limit:
+                giveaways = giveaways[:limit]
+                headers["X-Next-Cursor"] = encode_cursor(giveaways[-1])
+            if "createdAt" not in selected:
+                for giveaway in giveaways:
+                    del giveaway["createdAt"]
+            rendered = RenderedBody(giveaways, headers)
+            read_cache.set(cache_key, rendered, version)
+            return rendered
+
+        try:
+            # Keyed on the version too, so a read after a write never joins a query from before it
+            cached = await read_flights.run((version, cache_key), fill)
+        except DatabaseUnavailable as e:
+            return stale_response(request, cache_key, e)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to fetch giveaways: {str(e)}"
+            )
+    return conditional_response(request, cached)
+
+@app.get(
+    "/api/giveaways/search",
+    response_model=List[GiveawayListItem],
+    response_model_exclude_unset=True,
+)
+async def search_giveaways(
+    request: Request,
+    q: Optional[str] = Query(None, max_length=200),
+    prize: Optional[str] = None,
+    endsBefore: Optional[str] = None,
+    endsAfter: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """Search giveaways by text, exact prize and endDate range.
+
+    With ``q`` results are ranked by relevance, otherwise they are ordered
+    by endDate. Paginate with ``X-Next-Cursor`` as on the list endpoint.
+    """
+    selected = parse_fields(fields)
+    text = q.strip() if q and q.strip() else None
+    cursor = decode_search_cursor(after, text is not None) if after else None
+    filters: Dict[str, Any] = {}
+    if prize:
+        filters["prize"] = prize
+    ends_before = parse_date_filter(endsBefore, "endsBefore")
+    ends_after = parse_date_filter(endsAfter, "endsAfter")
+    if ends_before is not None or ends_after is not None:
+        filters["endDate"] = {}
+        if ends_after is not None:
+            filters["endDate"]["$gt"] = ends_after
+        if ends_before is not None:
+            filters["endDate"]["$lt"] = ends_before
+
+    cache_key = ("search", text, prize, ends_before, ends_after, limit, after, selected)
+    cached = read_cache.get(cache_key)
+    if cached is None:
+        version = read_cache.version
+
+        async def fill() -> RenderedBody:
+            # endDate and id are always fetched because the next cursor is built from them
+            projection = api_projection(selected + ("endDate",))
+            giveaways = await giveaway_repository.search(text, filters, limit + 1, cursor, projection)
+            headers = {}
+            if len(giveaways) > limit:
+                giveaways = giveaways[:limit]
+                headers["X-Next-Cursor"] = encode_search_cursor(giveaways[-1], text is not None)
+            for giveaway in giveaways:
+                giveaway.pop("score", None)
+                if "endDate" not in selected:
+                    del giveaway["endDate"]
+            rendered = RenderedBody(giveaways, headers)
+            read_cache.set(cache_key, rendered, version)
+            return rendered
+
+        try:
+            cached = await read_flights.run((version, cache_key), fill)
+        except DatabaseUnavailable as e:
+            return stale_response(request, cache_key, e)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to search giveaways: {str(e)}"
+            )
+    return conditional_response(request, cached)
+
+@app.get("/api/giveaways/active", response_model=List[GiveawayResponse])
+async def get_active_giveaways(request: Request):
+    """Get only active giveaways (not ended)"""
+    cached = read_cache.get("active")
+    if cached is not None:
+        return conditional_response(request, cached)
+    version = read_cache.version
+
+    async def fill() -> RenderedBody:
+        giveaways = await giveaway_repository.list_active(utcnow(), GIVEAWAY_PROJECTION)
+        rendered = RenderedBody(giveaways)
+        # Sorted by endDate, so the first item is the next one to leave the list
+        read_cache.set("active", rendered, version, giveaways[0]["endDate"] if giveaways else None)
+        return rendered
 
-@app.get("/api/giveaways", response_model=List[GiveawayResponse])
-async def get_giveaways():
-    """Get all giveaways"""
     try:
-        giveaways = list(giveaways_collection.find().sort("createdAt", -1))
-        return [giveaway_to_dict(giveaway) for giveaway in giveaways]
+        return conditional_response(request, await read_flights.run((version, "active"), fill))
+    except DatabaseUnavailable as e:
+        return stale_response(request, "active", e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to fetch giveaways: {str(e)}"
+            detail=f"Failed to fetch active giveaways: {str(e)}"
         )
 
-@app.get("/api/giveaways/active", response_model=List[GiveawayResponse])
-async def get_active_giveaways():
-    """Get only active giveaways (not ended)"""
+@app.get("/api/giveaways/stream")
+async def stream_giveaway_changes():
+    """Server-sent events for giveaway create/update/delete/expire/archive.
+
+    Each event's data is a JSON object with a ``type`` field. Clients should
+    refetch on (re)connect and on ``resync``, and apply the other events as
+    diffs. A client that stops reading is disconnected.
+    """
+    subscriber = broadcaster.subscribe()
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/api/giveaways/{giveaway_id}/entries", status_code=status.HTTP_202_ACCEPTED)
+async def enter_giveaway(giveaway_id: str, entry: GiveawayEntry):
+    """Enter a giveaway.
+
+    Entries are acknowledged once accepted in memory and written to MongoDB
+    in batches shortly after. Entering twice is not an error;
+    ``accepted`` is false the second time.
+    """
     try:
-        current_time = datetime.now().isoformat()
-        giveaways = list(giveaways_collection.find({
-            "endDate": {"$gt": current_time}
-        }).sort("endDate", 1))
-        return [giveaway_to_dict(giveaway) for giveaway in giveaways]
+        if not giveaway_counters.loaded:
+            await giveaway_counters.load()
+        if giveaway_id not in giveaway_counters.active_ends:
+            # Only the rejection path needs Mongo, to tell ended from unknown
+            if await giveaway_repository.find_one(giveaway_id, {"_id": 1}) is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Giveaway not found"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Giveaway has ended"
+            )
+        accepted = await entry_buffer.add(giveaway_id, entry.userId)
+        return {
+            "giveawayId": giveaway_id,
+            "userId": entry.userId,
+            "accepted": accepted,
+            "entryCount": entry_buffer.count(giveaway_id)
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to fetch active giveaways: {str(e)}"
+            detail=f"Failed to enter giveaway: {str(e)}"
         )
 
+@app.get("/api/giveaways/{giveaway_id}/entries/count")
+async def get_entry_count(giveaway_id: str):
+    """Number of entries for a giveaway, served from memory"""
+    return {"giveawayId": giveaway_id, "entryCount": entry_buffer.count(giveaway_id)}
+
 @app.post("/api/admin/login")
 async def admin_login(credentials: AdminLogin):
-    """Admin authentication"""
-    if credentials.password != ADMIN_PASSWORD:
+    """Admin authentication
+
+    Returns a bearer token for the admin routes, valid for
+    ``expiresIn`` seconds.
+    """
+    # The hash is deliberately slow, so keep it off the event loop
+    valid = await asyncio.to_thread(
+        admin_password_context.verify, credentials.password, ADMIN_PASSWORD_HASH
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid admin password"
         )
-    return {"message": "Admin authenticated successfully", "status": "success"}
+    return {
+        "message": "Admin authenticated successfully",
+        "status": "success",
+        "token": issue_admin_token(),
+        "tokenType": "bearer",
+        "expiresIn": ADMIN_TOKEN_TTL_SECONDS
+    }
 
-@app.post("/api/admin/giveaways", response_model=GiveawayResponse)
+@app.post("/api/admin/giveaways", response_model=GiveawayResponse, dependencies=[Depends(require_admin)])
 async def create_giveaway(giveaway: Giveaway):
     """Create a new giveaway (admin only)"""
     try:
         # Validate end date
         try:
-            end_date = datetime.fromisoformat(giveaway.endDate.replace('Z', '+00:00'))
-            if end_date <= datetime.now():
+            end_date = parse_datetime(giveaway.endDate)
+            if end_date <= utcnow():
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="End date must be in the future"
@@ -149,16 +2700,22 @@ async def create_giveaway(giveaway: Giveaway):
             "title": giveaway.title,
             "description": giveaway.description,
             "prize": giveaway.prize,
-            "endDate": giveaway.endDate,
+            "endDate": end_date,
             "entryRequirement": giveaway.entryRequirement,
-            "createdAt": datetime.now().isoformat()
+            "createdAt": utcnow(),
+            "version": 0
         }
 
         # Insert into database
-        result = giveaways_collection.insert_one(giveaway_doc)
+        result = await giveaway_repository.insert(giveaway_doc)
+        read_cache.invalidate()
         
         if result.inserted_id:
-            return giveaway_to_dict(giveaway_doc)
+            giveaway_counters.created(giveaway_doc["id"], end_date)
+            created = giveaway_to_dict(giveaway_doc)
+            announce("create", giveaway=created)
+            expiry_watcher.wake()
+            return created
         else:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -173,11 +2730,12 @@ async def create_giveaway(giveaway: Giveaway):
             detail=f"Failed to create giveaway: {str(e)}"
         )
 
-@app.delete("/api/admin/giveaways/{giveaway_id}")
+@app.delete("/api/admin/giveaways/{giveaway_id}", dependencies=[Depends(require_admin)])
 async def delete_giveaway(giveaway_id: str):
     """Delete a giveaway (admin only)"""
     try:
-        result = giveaways_collection.delete_one({"id": giveaway_id})
+        result = await giveaway_repository.delete(giveaway_id)
+        read_cache.invalidate()
         
         if result.deleted_count == 0:
             raise HTTPException(
@@ -185,6 +2743,10 @@ async def delete_giveaway(giveaway_id: str):
                 detail="Giveaway not found"
             )
         
+        giveaway_counters.deleted(giveaway_id)
+        entry_buffer.forget(giveaway_id)
+        await giveaway_repository.delete_entries(giveaway_id)
+        announce("delete", id=giveaway_id)
         return {"message": "Giveaway deleted successfully", "status": "success"}
 
     except HTTPException:
@@ -195,13 +2757,28 @@ async def delete_giveaway(giveaway_id: str):
             detail=f"Failed to delete giveaway: {str(e)}"
         )
 
-@app.put("/api/admin/giveaways/{giveaway_id}", response_model=GiveawayResponse)
-async def update_giveaway(giveaway_id: str, giveaway: Giveaway):
-    """Update a giveaway (admin only)"""
+@app.put(
+    "/api/admin/giveaways/{giveaway_id}",
+    response_model=GiveawayResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def update_giveaway(
+    giveaway_id: str,
+    giveaway: Giveaway,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+):
+    """Update a giveaway (admin only)
+
+    Send the ``version`` last read as ``If-Match`` to reject the edit with
+    412 if someone else changed the giveaway in the meantime. The new
+    version is returned in the body and as ``X-Giveaway-Version``.
+    """
+    expected_version = parse_if_match(if_match)
     try:
         # Validate end date
         try:
-            end_date = datetime.fromisoformat(giveaway.endDate.replace('Z', '+00:00'))
+            end_date = parse_datetime(giveaway.endDate)
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -213,25 +2790,35 @@ async def update_giveaway(giveaway_id: str, giveaway: Giveaway):
             "title": giveaway.title,
             "description": giveaway.description,
             "prize": giveaway.prize,
-            "endDate": giveaway.endDate,
+            "endDate": end_date,
             "entryRequirement": giveaway.entryRequirement,
-            "updatedAt": datetime.now().isoformat()
+            "updatedAt": utcnow()
         }
 
-        result = giveaways_collection.update_one(
-            {"id": giveaway_id},
-            {"$set": update_data}
+        updated_giveaway = await giveaway_repository.update(
+            giveaway_id, update_data, expected_version, GIVEAWAY_PROJECTION
         )
 
-        if result.matched_count == 0:
+        if updated_giveaway is None:
+            # Only a failed conditional write needs the extra lookup
+            if expected_version is not None and await giveaway_repository.find_one(giveaway_id, {"_id": 1}):
+                raise HTTPException(
+                    status_code=status.HTTP_412_PRECONDITION_FAILED,
+                    detail="Giveaway was modified by someone else"
+                )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Giveaway not found"
             )
 
-        # Fetch and return updated giveaway
-        updated_giveaway = giveaways_collection.find_one({"id": giveaway_id})
-        return giveaway_to_dict(updated_giveaway)
+        read_cache.invalidate()
+        giveaway_counters.updated(giveaway_id, end_date)
+        updated = giveaway_to_dict(updated_giveaway)
+        announce("update", giveaway=updated)
+        expiry_watcher.wake()
+        # Not an ETag: read endpoints tag whole response bodies, this is the document version
+        response.headers["X-Giveaway-Version"] = str(updated["version"])
+        return updated
 
     except HTTPException:
         raise
@@ -241,27 +2828,273 @@ async def update_giveaway(giveaway_id: str, giveaway: Giveaway):
             detail=f"Failed to update giveaway: {str(e)}"
         )
 
+@app.post("/api/admin/giveaways/{giveaway_id}/draw", dependencies=[Depends(require_admin)])
+async def draw_giveaway_winners(
+    giveaway_id: str,
+    winners: int = Query(1, ge=1, le=MAX_DRAW_WINNERS),
+):
+    """Draw winners for an ended giveaway (admin only)
+
+    The seed, algorithm and result are stored on the giveaway as ``draw``
+    so the draw can be audited and replayed. A giveaway is drawn once,
+    whether it is still live or already archived.
+    """
+    try:
+        giveaway, archived = await giveaway_repository.find_with_archive(
+            giveaway_id, {"_id": 0, "endDate": 1, "version": 1, "draw": 1}
+        )
+        if giveaway is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Giveaway not found"
+            )
+        if giveaway["endDate"] > utcnow():
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Giveaway has not ended yet"
+            )
+        if giveaway.get("draw"):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Winners have already been drawn"
+            )
+
+        # Entries accepted just before the end may still be buffered
+        await entry_buffer.flush()
+        seed = secrets.token_hex(16)
+        picked, entry_count = await draw_winners(giveaway_id, winners, seed)
+        draw = {
+            "seed": seed,
+            "algorithm": DRAW_ALGORITHM,
+            "winnersRequested": winners,
+            "winners": picked,
+            "entryCount": entry_count,
+            "drawnAt": utcnow()
+        }
+
+        # Conditional on the version read above, so concurrent draws cannot both win
+        updated_giveaway = await giveaway_repository.update(
+            giveaway_id, {"draw": draw}, giveaway.get("version", 0), GIVEAWAY_PROJECTION, archived
+        )
+        if updated_giveaway is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Giveaway was modified while drawing"
+            )
+
+        read_cache.invalidate()
+        if not archived:
+            # Archived giveaways are not in any worker's counters or client lists
+            announce("update", giveaway=giveaway_to_dict(updated_giveaway))
+        return {"giveawayId": giveaway_id, **draw, "drawnAt": format_datetime(draw["drawnAt"])}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to draw winners: {str(e)}"
+        )
+
+@app.get("/api/admin/giveaways/{giveaway_id}/draw", dependencies=[Depends(require_admin)])
+async def verify_giveaway_draw(giveaway_id: str):
+    """Replay a stored draw from its seed and report whether it matches (admin only)"""
+    try:
+        giveaway, _ = await giveaway_repository.find_with_archive(giveaway_id, {"_id": 0, "draw": 1})
+        if giveaway is None or not giveaway.get("draw"):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No draw found for this giveaway"
+            )
+        draw = giveaway["draw"]
+        replayed, entry_count = await draw_winners(giveaway_id, draw["winnersRequested"], draw["seed"])
+        return {
+            "giveawayId": giveaway_id,
+            **draw,
+            "drawnAt": format_datetime(draw["drawnAt"]),
+            "replayedWinners": replayed,
+            "replayedEntryCount": entry_count,
+            "verified": replayed == draw["winners"] and entry_count == draw["entryCount"]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to verify draw: {str(e)}"
+        )
+
+@app.post("/api/admin/giveaways/bulk", dependencies=[Depends(require_admin)])
+async def bulk_import_giveaways(request: Request):
+    """Bulk create giveaways from an NDJSON body (admin only)
+
+    Rows are validated as they stream in and inserted unordered in chunks,
+    so one bad row does not stop the rest. Rows may carry their original
+    ``id``/``createdAt`` and past end dates, so an export can be replayed
+    into another environment.
+    """
+    inserted = 0
+    failed = 0
+    errors = []
+
+    def report(line_number: int, message: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < BULK_MAX_REPORTED_ERRORS:
+            errors.append({"line": line_number, "error": message})
+
+    async def flush(chunk: List[Tuple[int, dict]]):
+        nonlocal inserted
+        count, chunk_errors = await giveaway_repository.insert_many([doc for _, doc in chunk])
+        inserted += count
+        for index, (line_number, doc) in enumerate(chunk):
+            if index in chunk_errors:
+                report(line_number, chunk_errors[index])
+            else:
+                giveaway_counters.created(doc["id"], doc["endDate"])
+
+    try:
+        chunk = []
+        async for line_number, line in iter_ndjson_lines(request):
+            try:
+                chunk.append((line_number, bulk_row_to_doc(line)))
+            except ValueError as e:
+                report(line_number, str(e))
+                continue
+            if len(chunk) >= BULK_CHUNK_SIZE:
+                await flush(chunk)
+                chunk = []
+        if chunk:
+            await flush(chunk)
+    except DatabaseUnavailable as e:
+        e.detail = f"Bulk import stopped after {inserted} giveaways: {e.detail}"
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Bulk import failed after {inserted} giveaways: {str(e)}"
+        )
+    finally:
+        if inserted:
+            read_cache.invalidate()
+            announce("resync")
+            expiry_watcher.wake()
+
+    return {
+        "inserted": inserted,
+        "failed": failed,
+        "errors": errors,
+        "errorsTruncated": failed > len(errors)
+    }
+
+@app.get("/api/admin/giveaways/export", dependencies=[Depends(require_admin)])
+async def export_giveaways():
+    """Stream every giveaway as NDJSON, oldest first (admin only)"""
+    giveaways = giveaway_repository.iter_all(GIVEAWAY_PROJECTION)
+    # Fetch the first batch before committing to a 200, so an unreachable
+    # database is still answered with a 503
+    try:
+        first = await giveaways.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export giveaways: {str(e)}"
+        )
+
+    async def rows() -> AsyncIterator[bytes]:
+        if first is None:
+            return
+        yield orjson.dumps(first, option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+        async for giveaway in giveaways:
+            yield orjson.dumps(giveaway, option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+
+    return StreamingResponse(
+        rows(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="giveaways.ndjson"'},
+    )
+
+@app.get("/api/admin/analytics", dependencies=[Depends(require_admin)])
+async def get_analytics(
+    request: Request,
+    bucket: str = Query("day", pattern="^(day|week|month)$"),
+):
+    """Giveaway creation/end rates, durations and entry percentiles (admin only)
+
+    Covers live and archived giveaways. Results are reused until a
+    giveaway or entry changes.
+    """
+    try:
+        rendered = analytics_memo.get(bucket)
+        if rendered is None:
+            version = analytics_memo.data_version()
+
+            async def fill() -> RenderedBody:
+                created, ends, entries = await load_analytics_columns()
+                # pandas work is CPU-bound, so keep it off the event loop
+                analytics = await asyncio.to_thread(compute_analytics, created, ends, entries, bucket, utcnow())
+                rendered = RenderedBody({**analytics, "generatedAt": format_datetime(utcnow())})
+                analytics_memo.set(bucket, version, rendered)
+                return rendered
+
+            rendered = await read_flights.run((version, "analytics", bucket), fill)
+        return conditional_response(request, rendered)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compute analytics: {str(e)}"
+        )
+
 @app.get("/api/stats")
-async def get_community_stats():
+async def get_community_stats(request: Request):
     """Get community statistics"""
     try:
-        total_giveaways = giveaways_collection.count_documents({})
-        active_giveaways = giveaways_collection.count_documents({
-            "endDate": {"$gt": datetime.now().isoformat()}
-        })
-        
-        return {
-            "totalGiveaways": total_giveaways,
-            "activeGiveaways": active_giveaways,
-            "memberCount": 500,  # Static for now
+        if not giveaway_counters.loaded:
+            await giveaway_counters.load()
+        # Sweep here too so the count is exact even if the watcher is late
+        expiry_watcher.sweep()
+        rendered = RenderedBody({
+            "totalGiveaways": giveaway_counters.total + giveaway_counters.archived,
+            "activeGiveaways": giveaway_counters.active,
+            "memberCount": member_count.count,
             "communityStatus": "active"
-        }
+        })
+        return conditional_response(request, rendered)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch stats: {str(e)}"
         )
 
+# Must stay after every route: the frontend mount catches all remaining paths
+if frontend_files is not None:
+    app.mount("/", frontend_files, name="frontend")
+
 if __name__ == "__main__":
     import uvicorn
+    if WEB_CONCURRENCY > 1:
+        if not PROMETHEUS_MULTIPROC_DIR:
+            os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="rbc-metrics-")
+        else:
+            # Files left by a previous run would be added to this one's counters
+            for stale in glob.glob(os.path.join(PROMETHEUS_MULTIPROC_DIR, "*.db")):
+                os.remove(stale)
+        # Workers import the app by name; re-exec through uvicorn's CLI so
+        # they do not also re-run this file as __main__ and register every
+        # metric twice
+        os.execv(sys.executable, [
+            sys.executable, "-m", "uvicorn", "server:app",
+            "--host", "0.0.0.0",
+            "--port", "8001",
+            "--workers", str(WEB_CONCURRENCY),
+            "--app-dir", os.path.dirname(os.path.abspath(__file__)),
+        ])
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
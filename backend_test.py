@@ -33,6 +33,13 @@ def create_test_giveaway_data():
     }
 
 class RBCCommunityAPITest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Admin routes need the bearer token issued by the login endpoint
+        response = requests.post(f"{BACKEND_URL}/api/admin/login", json={"password": ADMIN_PASSWORD})
+        response.raise_for_status()
+        cls.admin_headers = {"Authorization": f"Bearer {response.json()['token']}"}
+
     def setUp(self):
         self.base_url = BACKEND_URL
         self.api_url = f"{BACKEND_URL}/api"
@@ -50,7 +57,7 @@ class RBCCommunityAPITest(unittest.TestCase):
 
     def _delete_giveaway(self, giveaway_id):
         """Helper method to delete a giveaway"""
-        response = requests.delete(f"{self.api_url}/admin/giveaways/{giveaway_id}")
+        response = requests.delete(f"{self.api_url}/admin/giveaways/{giveaway_id}", headers=self.admin_headers)
         return response
 
     def test_01_root_endpoint(self):
@@ -134,6 +141,8 @@ class RBCCommunityAPITest(unittest.TestCase):
         self.assertIn("message", data)
         self.assertIn("Admin authenticated successfully", data["message"])
         self.assertEqual(data["status"], "success")
+        self.assertIn("token", data)
+        self.assertEqual(data["tokenType"], "bearer")
 
     def test_07_admin_login_failure(self):
         """Test admin login with incorrect password"""
@@ -154,7 +163,7 @@ class RBCCommunityAPITest(unittest.TestCase):
         giveaway_data = create_test_giveaway_data()
         print(f"Creating giveaway with data: {json.dumps(giveaway_data, indent=2)}")
         
-        response = requests.post(f"{self.api_url}/admin/giveaways", json=giveaway_data)
+        response = requests.post(f"{self.api_url}/admin/giveaways", json=giveaway_data, headers=self.admin_headers)
         print(f"Response status: {response.status_code}")
         print(f"Response body: {response.text}")
         
@@ -183,7 +192,7 @@ class RBCCommunityAPITest(unittest.TestCase):
         }
         
         print(f"Creating giveaway with past date: {json.dumps(giveaway_data, indent=2)}")
-        response = requests.post(f"{self.api_url}/admin/giveaways", json=giveaway_data)
+        response = requests.post(f"{self.api_url}/admin/giveaways", json=giveaway_data, headers=self.admin_headers)
         print(f"Response status: {response.status_code}")
         print(f"Response body: {response.text}")
         
@@ -204,7 +213,7 @@ class RBCCommunityAPITest(unittest.TestCase):
         }
         
         print(f"Creating giveaway with invalid date: {json.dumps(giveaway_data, indent=2)}")
-        response = requests.post(f"{self.api_url}/admin/giveaways", json=giveaway_data)
+        response = requests.post(f"{self.api_url}/admin/giveaways", json=giveaway_data, headers=self.admin_headers)
         print(f"Response status: {response.status_code}")
         print(f"Response body: {response.text}")
         
@@ -230,7 +239,9 @@ class RBCCommunityAPITest(unittest.TestCase):
         }
         
         print(f"Updating giveaway {giveaway_id} with data: {json.dumps(updated_data, indent=2)}")
-        response = requests.put(f"{self.api_url}/admin/giveaways/{giveaway_id}", json=updated_data)
+        response = requests.put(
+            f"{self.api_url}/admin/giveaways/{giveaway_id}", json=updated_data, headers=self.admin_headers
+        )
         print(f"Response status: {response.status_code}")
         print(f"Response body: {response.text}")
         
@@ -285,6 +296,23 @@ class RBCCommunityAPITest(unittest.TestCase):
         self.assertIn("detail", data)
         self.assertIn("Giveaway not found", data["detail"])
 
+    def test_14_admin_route_requires_token(self):
+        """Test that admin routes reject requests without a valid token"""
+        print("\n--- Testing Admin Route Without Token ---")
+        response = requests.post(f"{self.api_url}/admin/giveaways", json=create_test_giveaway_data())
+        print(f"Response status: {response.status_code}")
+        print(f"Response body: {response.text}")
+
+        self.assertEqual(response.status_code, 401)
+
+        response = requests.delete(
+            f"{self.api_url}/admin/giveaways/nonexistent-id-12345",
+            headers={"Authorization": "Bearer not-a-token"}
+        )
+        print(f"Response status: {response.status_code}")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Invalid or expired admin token", response.json()["detail"])
+
 if __name__ == "__main__":
     print(f"Starting RBC Community API Tests against {BACKEND_URL}")
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
\ No newline at end of file
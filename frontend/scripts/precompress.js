@@ -0,0 +1,36 @@
+// Writes .gz and .br siblings for compressible build assets so the backend
+// can serve them without compressing on every request. Runs after `build`.
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+const BUILD_DIR = path.join(__dirname, '..', 'build');
+const COMPRESSIBLE = /\.(js|css|html|json|svg|txt)$/;
+const MIN_SIZE = 1024;
+
+const walk = (dir) =>
+  fs.readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+    const fullPath = path.join(dir, entry.name);
+    return entry.isDirectory() ? walk(fullPath) : [fullPath];
+  });
+
+for (const file of walk(BUILD_DIR)) {
+  if (!COMPRESSIBLE.test(file)) {
+    continue;
+  }
+  const content = fs.readFileSync(file);
+  if (content.length < MIN_SIZE) {
+    continue;
+  }
+  fs.writeFileSync(`${file}.gz`, zlib.gzipSync(content, { level: zlib.constants.Z_BEST_COMPRESSION }));
+  fs.writeFileSync(
+    `${file}.br`,
+    zlib.brotliCompressSync(content, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: content.length,
+      },
+    })
+  );
+  console.log(`Precompressed ${path.relative(BUILD_DIR, file)}`);
+}
@@ -1,9 +1,15 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import './App.css';
 
 const App = () => {
   const [giveaways, setGiveaways] = useState([]);
+  const [adminGiveaways, setAdminGiveaways] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [stats, setStats] = useState(null);
+  const giveawaysEtag = useRef(null);
+  const statsRefresh = useRef(null);
   const [isAdmin, setIsAdmin] = useState(false);
+  const [adminToken, setAdminToken] = useState(null);
   const [adminPassword, setAdminPassword] = useState('');
   const [showAdminLogin, setShowAdminLogin] = useState(false);
   const [loading, setLoading] = useState(false);
@@ -19,15 +25,77 @@ const App = () => {
 
   useEffect(() => {
     fetchGiveaways();
-    const interval = setInterval(fetchGiveaways, 30000); // Auto-refresh every 30 seconds
-    return () => clearInterval(interval);
+    // Live updates replace polling; (re)connecting may have missed events, so
+    // revalidate the list on open (a cheap 304 when nothing changed)
+    const source = new EventSource(`${backendUrl}/api/giveaways/stream`);
+    source.onopen = () => {
+      fetchGiveaways();
+      fetchStats();
+    };
+    source.onmessage = (message) => {
+      applyGiveawayChange(JSON.parse(message.data));
+      scheduleStatsRefresh();
+    };
+    return () => {
+      source.close();
+      clearTimeout(statsRefresh.current);
+    };
   }, []);
 
+  // Every open tab receives each event at the same moment; coalesce a burst
+  // of events into one refetch and spread tabs over a random delay so they
+  // don't all hit /api/stats together
+  const scheduleStatsRefresh = () => {
+    if (statsRefresh.current) {
+      return;
+    }
+    statsRefresh.current = setTimeout(() => {
+      statsRefresh.current = null;
+      fetchStats();
+    }, 1000 + Math.random() * 4000);
+  };
+
+  const fetchStats = async () => {
+    try {
+      const response = await fetch(`${backendUrl}/api/stats`);
+      if (response.ok) {
+        setStats(await response.json());
+      }
+    } catch (error) {
+      console.error('Error fetching stats:', error);
+    }
+  };
+
+  const applyGiveawayChange = (change) => {
+    if (change.type === 'resync') {
+      fetchGiveaways();
+      return;
+    }
+    setGiveaways((current) => {
+      if (change.type === 'delete' || change.type === 'expire' || change.type === 'archive') {
+        return current.filter(g => g.id !== change.id);
+      }
+      const others = current.filter(g => g.id !== change.giveaway.id);
+      if (new Date(change.giveaway.endDate) <= new Date()) {
+        return others;
+      }
+      return [...others, change.giveaway].sort((a, b) => new Date(a.endDate) - new Date(b.endDate));
+    });
+  };
+
   const fetchGiveaways = async () => {
     try {
-      const response = await fetch(`${backendUrl}/api/giveaways`);
+      // Revalidate with the last ETag; an unchanged list comes back as an empty 304
+      const response = await fetch(`${backendUrl}/api/giveaways/active`, {
+        cache: 'no-store',
+        headers: giveawaysEtag.current ? { 'If-None-Match': giveawaysEtag.current } : {}
+      });
+      if (response.status === 304) {
+        return;
+      }
       if (response.ok) {
         const data = await response.json();
+        giveawaysEtag.current = response.headers.get('ETag');
         setGiveaways(data);
       }
     } catch (error) {
@@ -35,6 +103,27 @@ const App = () => {
     }
   };
 
+  // Admin list is paginated; pass the previous X-Next-Cursor to load more
+  const fetchAdminGiveaways = async (after = null) => {
+    try {
+      const query = after ? `?after=${encodeURIComponent(after)}` : '';
+      const response = await fetch(`${backendUrl}/api/giveaways${query}`);
+      if (response.ok) {
+        const data = await response.json();
+        setAdminGiveaways(after ? (current) => [...current, ...data] : data);
+        setNextCursor(response.headers.get('X-Next-Cursor'));
+      }
+    } catch (error) {
+      console.error('Error fetching giveaways:', error);
+    }
+  };
+
+  useEffect(() => {
+    if (isAdmin) {
+      fetchAdminGiveaways();
+    }
+  }, [isAdmin]);
+
   const handleAdminLogin = async (e) => {
     e.preventDefault();
     setLoading(true);
@@ -46,6 +135,8 @@ const App = () => {
       });
       
       if (response.ok) {
+        const data = await response.json();
+        setAdminToken(data.token);
         setIsAdmin(true);
         setShowAdminLogin(false);
         setAdminPassword('');
@@ -59,17 +150,35 @@ const App = () => {
     setLoading(false);
   };
 
+  const adminHeaders = (headers = {}) => ({ ...headers, Authorization: `Bearer ${adminToken}` });
+
+  const logoutAdmin = () => {
+    setIsAdmin(false);
+    setAdminToken(null);
+  };
+
+  // Admin tokens are short-lived; a 401 means the session has expired
+  const checkAdminSession = (response) => {
+    if (response.status === 401) {
+      logoutAdmin();
+      alert('Your admin session has expired. Please log in again.');
+      return false;
+    }
+    return true;
+  };
+
   const handleAddGiveaway = async (e) => {
     e.preventDefault();
     setLoading(true);
     try {
       const response = await fetch(`${backendUrl}/api/admin/giveaways`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(newGiveaway)
+        headers: adminHeaders({ 'Content-Type': 'application/json' }),
+        // datetime-local values carry no offset; send UTC so the backend stores the intended instant
+        body: JSON.stringify({ ...newGiveaway, endDate: new Date(newGiveaway.endDate).toISOString() })
       });
       
-      if (response.ok) {
+      if (checkAdminSession(response) && response.ok) {
         setNewGiveaway({
           title: '',
           description: '',
@@ -78,6 +187,7 @@ const App = () => {
           entryRequirement: ''
         });
         fetchGiveaways();
+        fetchAdminGiveaways();
         alert('Giveaway added successfully!');
       }
     } catch (error) {
@@ -91,11 +201,13 @@ const App = () => {
     if (window.confirm('Are you sure you want to delete this giveaway?')) {
       try {
         const response = await fetch(`${backendUrl}/api/admin/giveaways/${giveawayId}`, {
-          method: 'DELETE'
+          method: 'DELETE',
+          headers: adminHeaders()
         });
         
-        if (response.ok) {
+        if (checkAdminSession(response) && response.ok) {
           fetchGiveaways();
+          fetchAdminGiveaways();
           alert('Giveaway deleted successfully!');
         }
       } catch (error) {
@@ -255,11 +367,11 @@ const App = () => {
           <h3 className="text-4xl font-bold text-white mb-12">Community Stats</h3>
           <div className="grid md:grid-cols-3 gap-8">
             <div className="bg-black bg-opacity-30 backdrop-blur-sm p-6 rounded-xl border border-orange-400">
-              <div className="text-4xl font-bold text-orange-300 mb-2">500+</div>
+              <div className="text-4xl font-bold text-orange-300 mb-2">{stats ? stats.memberCount : '500+'}</div>
               <div className="text-orange-100">Active Members</div>
             </div>
             <div className="bg-black bg-opacity-30 backdrop-blur-sm p-6 rounded-xl border border-orange-400">
-              <div className="text-4xl font-bold text-orange-300 mb-2">50+</div>
+              <div className="text-4xl font-bold text-orange-300 mb-2">{stats ? stats.totalGiveaways : '50+'}</div>
               <div className="text-orange-100">Giveaways Hosted</div>
             </div>
             <div className="bg-black bg-opacity-30 backdrop-blur-sm p-6 rounded-xl border border-orange-400">
@@ -330,7 +442,7 @@ const App = () => {
             <div className="flex justify-between items-center mb-6">
               <h3 className="text-3xl font-bold text-gray-800">Admin Panel</h3>
               <button
-                onClick={() => setIsAdmin(false)}
+                onClick={logoutAdmin}
                 className="bg-red-500 hover:bg-red-600 text-white px-4 py-2 rounded-lg transition-colors"
               >
                 Close
@@ -393,11 +505,11 @@ const App = () => {
             {/* Current Giveaways */}
             <div>
               <h4 className="text-xl font-bold text-gray-800 mb-4">Current Giveaways</h4>
-              {giveaways.length === 0 ? (
+              {adminGiveaways.length === 0 ? (
                 <p className="text-gray-600">No giveaways found.</p>
               ) : (
                 <div className="space-y-4 max-h-96 overflow-y-auto">
-                  {giveaways.map((giveaway) => (
+                  {adminGiveaways.map((giveaway) => (
                     <div key={giveaway.id} className="p-4 border border-gray-200 rounded-lg">
                       <div className="flex justify-between items-start">
                         <div className="flex-1">
@@ -418,6 +530,14 @@ const App = () => {
                       </div>
                     </div>
                   ))}
+                  {nextCursor && (
+                    <button
+                      onClick={() => fetchAdminGiveaways(nextCursor)}
+                      className="w-full bg-gray-200 hover:bg-gray-300 text-gray-800 py-2 rounded-lg transition-colors"
+                    >
+                      Load more
+                    </button>
+                  )}
                 </div>
               )}
             </div>
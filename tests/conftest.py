@@ -0,0 +1,41 @@
+import os
+import sys
+
+import httpx
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+TEST_ADMIN_PASSWORD = "test-admin-password"
+# Precomputed so importing the app does not pay for a full-strength hash
+os.environ.setdefault(
+    "ADMIN_PASSWORD_HASH",
+    "$pbkdf2-sha256$1000$DqF0bk2JMcZYqzXGWCvFmA$IPNw2a5h8tJYi1eVxUGhf1aJAI1o7oxl9nLDN9iajOA",
+)
+os.environ.setdefault("ADMIN_TOKEN_SECRET", "test-admin-token-secret-of-sufficient-length")
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client(monkeypatch):
+    """The app on a fresh in-memory database, authenticated as admin"""
+    from mongomock_motor import AsyncMongoMockClient
+
+    monkeypatch.setattr(server.giveaway_repository, "client_factory", lambda *_, **kwargs: AsyncMongoMockClient(**kwargs))
+    monkeypatch.setattr(server.rate_limiter, "enabled", False)
+    server.read_cache.invalidate()
+    await server.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        headers = {"Authorization": f"Bearer {server.issue_admin_token()}"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as test_client:
+            yield test_client
+    finally:
+        await server.app.router.shutdown()
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tests.conftest import BACKEND_DIR, TEST_ADMIN_PASSWORD
+
+pytestmark = pytest.mark.anyio
+
+
+def import_server(**env):
+    clean = {key: value for key, value in os.environ.items() if not key.startswith(("ADMIN_", "WEB_CONCURRENCY"))}
+    return subprocess.run(
+        [sys.executable, "-c", "import server"],
+        cwd=BACKEND_DIR, env={**clean, **env}, capture_output=True, text=True, timeout=60,
+    )
+
+
+def test_refuses_to_start_without_a_password_hash():
+    result = import_server(ADMIN_TOKEN_SECRET="secret")
+    assert result.returncode != 0
+    assert "ADMIN_PASSWORD_HASH is not set" in result.stderr
+
+
+def test_refuses_a_generated_token_secret_with_several_workers():
+    result = import_server(ADMIN_DEV_DEFAULTS="true", WEB_CONCURRENCY="2")
+    assert result.returncode != 0
+    assert "ADMIN_TOKEN_SECRET is not set" in result.stderr
+    assert import_server(ADMIN_DEV_DEFAULTS="true").returncode == 0
+
+
+async def test_login_token_opens_admin_routes(client):
+    client.headers.pop("Authorization")
+    assert (await client.get("/api/admin/analytics")).status_code == 401
+    assert (await client.post("/api/admin/login", json={"password": "wrong"})).status_code == 401
+
+    response = await client.post("/api/admin/login", json={"password": TEST_ADMIN_PASSWORD})
+    assert response.status_code == 200, response.text
+    token = response.json()["token"]
+    response = await client.get("/api/admin/analytics", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
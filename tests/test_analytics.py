@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import server
+
+
+def dates(*values):
+    return np.array(values, dtype="datetime64[ms]")
+
+
+def test_weekly_buckets_are_labelled_by_their_monday():
+    # Wednesday and Sunday of the week starting Monday 2026-10-12
+    analytics = server.compute_analytics(
+        dates("2026-10-18T12:00"), dates("2026-10-14T12:00"), np.array([0]), "week", datetime(2026, 10, 20)
+    )
+    assert analytics["rates"] == [{"start": "2026-10-12T00:00:00Z", "created": 1, "ended": 1}]
+
+
+def test_a_monday_starts_a_new_week():
+    analytics = server.compute_analytics(
+        dates("2026-10-11T23:59", "2026-10-12T00:00"), dates("2026-11-01", "2026-11-01"),
+        np.array([0, 0]), "week", datetime(2026, 10, 20)
+    )
+    assert [row["start"] for row in analytics["rates"]] == ["2026-10-05T00:00:00Z", "2026-10-12T00:00:00Z"]
+
+
+@pytest.mark.anyio
+async def test_memoized_analytics_follow_expiry(client, monkeypatch):
+    end = server.utcnow() + timedelta(days=1)
+    response = await client.post("/api/admin/giveaways", json={
+        "title": "t", "description": "d", "prize": "p", "endDate": end.isoformat(), "entryRequirement": "r",
+    })
+    assert response.status_code == 200, response.text
+    assert (await client.get("/api/admin/analytics")).json()["active"] == 1
+
+    later = end + timedelta(minutes=1)
+    monkeypatch.setattr(server, "utcnow", lambda: later)
+    server.expiry_watcher.sweep()
+    analytics = (await client.get("/api/admin/analytics")).json()
+    assert analytics["active"] == 0
+    assert analytics["rates"][-1]["ended"] == 1
+
+
+@pytest.mark.anyio
+async def test_rows_with_unparseable_dates_are_left_out(client):
+    now = server.utcnow()
+    await server.giveaway_repository.collection.insert_many([
+        {"id": "legacy", "title": "t", "description": "d", "prize": "p", "entryRequirement": "r",
+         "endDate": "next friday", "createdAt": now, "version": 0},
+        {"id": "dated", "title": "t", "description": "d", "prize": "p", "entryRequirement": "r",
+         "endDate": now + timedelta(days=1), "createdAt": now, "version": 0},
+    ])
+    response = await client.get("/api/admin/analytics")
+    assert response.status_code == 200, response.text
+    assert response.json()["giveaways"] == 1
@@ -0,0 +1,56 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def giveaway(end_date, **extra):
+    now = server.utcnow()
+    return {
+        "id": str(uuid.uuid4()),
+        "title": "t",
+        "description": "d",
+        "prize": "p",
+        "endDate": end_date,
+        "entryRequirement": "r",
+        "createdAt": now - timedelta(days=90),
+        "version": 0,
+        **extra,
+    }
+
+
+async def test_legacy_end_dates_do_not_block_archiving(client):
+    repository = server.giveaway_repository
+    legacy = [giveaway("not a date"), giveaway(None)]
+    del legacy[1]["endDate"]
+    expired = giveaway(server.utcnow().replace(microsecond=0) - timedelta(days=60))
+    await repository.collection.insert_many(legacy + [expired])
+
+    assert await repository.oldest_end() == expired["endDate"]
+    archived = await repository.archive_ended(server.utcnow() - timedelta(days=30))
+    assert archived == [expired["id"]]
+    # The legacy documents stay live for someone to fix by hand
+    assert await repository.count() == 2
+    assert await repository.oldest_end() is None
+
+
+async def test_archiving_keeps_a_giveaway_edited_meanwhile(client, monkeypatch):
+    repository = server.giveaway_repository
+    ended = giveaway(server.utcnow() - timedelta(days=60))
+    await repository.collection.insert_one(ended)
+
+    bulk_write = repository.archive.bulk_write
+
+    async def draw_while_archiving(*args, **kwargs):
+        result = await bulk_write(*args, **kwargs)
+        await repository.collection.update_one({"id": ended["id"]}, {"$set": {"draw": {}}, "$inc": {"version": 1}})
+        return result
+    monkeypatch.setattr(repository.archive, "bulk_write", draw_while_archiving)
+
+    assert await repository.archive_ended(server.utcnow()) == []
+    assert await repository.find_one(ended["id"]) is not None
+    assert await repository.archive.count_documents({}) == 0
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeRequest:
+    """Just enough of a Request for iter_ndjson_lines"""
+
+    def __init__(self, *chunks: bytes):
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+async def lines(*chunks: bytes):
+    return [item async for item in server.iter_ndjson_lines(FakeRequest(*chunks))]
+
+
+def row(**overrides) -> dict:
+    return {
+        "title": "t",
+        "description": "d",
+        "prize": "p",
+        "endDate": "2030-01-01T00:00:00Z",
+        "entryRequirement": "r",
+        **overrides,
+    }
+
+
+async def test_lines_split_across_chunks():
+    assert await lines(b'{"a":', b'1}\n{"b"', b":2}\n") == [(1, b'{"a":1}'), (2, b'{"b":2}')]
+
+
+async def test_trailing_line_without_newline():
+    assert await lines(b"one\ntw", b"o") == [(1, b"one"), (2, b"two")]
+    assert await lines(b"one\n") == [(1, b"one")]
+    assert await lines() == []
+
+
+async def test_blank_lines_are_skipped_but_counted():
+    assert await lines(b"\none\n  \r\n\n", b"two\n\n") == [(2, b"one"), (5, b"two")]
+
+
+async def test_oversized_lines_become_empty(monkeypatch):
+    monkeypatch.setattr(server, "BULK_MAX_LINE_BYTES", 8)
+    # Spread over chunks, arriving in a single chunk, and as the last line
+    assert await lines(b"ok\n0123", b"456789", b"abc\nok\n") == [(1, b"ok"), (2, b""), (3, b"ok")]
+    assert await lines(b"0123456789abc\nok\n") == [(1, b""), (2, b"ok")]
+    assert await lines(b"ok\n0123456789", b"abc") == [(1, b"ok"), (2, b"")]
+    assert await lines(b"12345678\n") == [(1, b"12345678")]
+
+
+def test_row_errors_are_readable():
+    with pytest.raises(ValueError, match="empty or too long"):
+        server.bulk_row_to_doc(b"")
+    with pytest.raises(ValueError, match="title"):
+        server.bulk_row_to_doc(json.dumps({k: v for k, v in row().items() if k != "title"}).encode())
+    with pytest.raises(ValueError, match="Invalid date format"):
+        server.bulk_row_to_doc(json.dumps(row(endDate="next week")).encode())
+    doc = server.bulk_row_to_doc(json.dumps(row(id="kept")).encode())
+    assert doc["id"] == "kept" and doc["endDate"].year == 2030
+
+
+async def test_import_reports_errors_by_line(client):
+    body = b"\n".join([
+        json.dumps(row(id="a")).encode(),
+        b"",
+        b"{not json",
+        json.dumps(row(endDate="soon")).encode(),
+        json.dumps(row(id="a")).encode(),
+        json.dumps(row(id="b")).encode(),
+    ])
+    response = await client.post("/api/admin/giveaways/bulk", content=body)
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["inserted"] == 2
+    assert result["failed"] == 3
+    assert [error["line"] for error in result["errors"]] == [3, 4, 5]
+    assert result["errorsTruncated"] is False
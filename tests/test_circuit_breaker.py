@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+import server
+
+
+def test_opens_after_threshold_and_recovers_through_half_open():
+    breaker = server.CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert 9 < breaker.retry_after() <= 10
+
+    # Once the reset timeout has passed one trial call is let through
+    breaker._changed_at -= 10
+    assert breaker.allow()
+    assert breaker.state == "half-open"
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+def test_failed_trial_reopens_immediately():
+    breaker = server.CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    for _ in range(3):
+        breaker.record_failure()
+    breaker._changed_at -= 10
+    assert breaker.allow() and breaker.state == "half-open"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_success_resets_the_failure_count():
+    breaker = server.CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+class FlakyCursorRepository:
+    def __init__(self, fail_after):
+        self.breaker = server.CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        self.fail_after = fail_after
+
+    @server.guarded_iter
+    async def rows(self):
+        for i in range(3):
+            if i == self.fail_after:
+                raise ServerSelectionTimeoutError("no servers")
+            yield i
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_cursor_failures_open_the_circuit_and_then_fail_fast():
+    repository = FlakyCursorRepository(fail_after=1)
+    with pytest.raises(server.DatabaseUnavailable):
+        asyncio.run(collect(repository.rows()))
+    assert repository.breaker.state == "open"
+
+    repository.fail_after = None
+    with pytest.raises(server.DatabaseUnavailable) as raised:
+        asyncio.run(collect(repository.rows()))
+    assert raised.value.status_code == 503
+    assert "Retry-After" in raised.value.headers
+
+
+def test_database_preparation_retries_failed_steps(monkeypatch):
+    calls = {"flaky": 0, "steady": 0}
+
+    async def flaky():
+        calls["flaky"] += 1
+        if calls["flaky"] < 3:
+            raise server.DatabaseUnavailable(1)
+
+    async def steady():
+        calls["steady"] += 1
+
+    async def no_sleep(delay):
+        pass
+    monkeypatch.setattr(server.asyncio, "sleep", no_sleep)
+
+    steps = [("flaky step", flaky), ("steady step", steady)]
+    assert asyncio.run(server.prepare_database(steps)) == [("flaky step", flaky)]
+    calls.update(flaky=0, steady=0)
+    assert asyncio.run(server.prepare_database(steps, retry=True)) == []
+    assert calls == {"flaky": 3, "steady": 1}
@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def projected_updates(monkeypatch):
+    update = server.giveaway_repository.update
+
+    async def update_then_project(giveaway_id, update_data, expected_version=None, projection=None, archived=False):
+        # mongomock returns nothing when projecting find_one_and_update on a filtered field
+        doc = await update(giveaway_id, update_data, expected_version, None, archived)
+        return doc and {key: value for key, value in doc.items() if key in projection}
+    monkeypatch.setattr(server.giveaway_repository, "update", update_then_project)
+
+
+def body(title: str) -> dict:
+    return {
+        "title": title,
+        "description": "d",
+        "prize": "p",
+        "endDate": (server.utcnow() + timedelta(days=1)).isoformat(),
+        "entryRequirement": "r",
+    }
+
+
+async def test_second_edit_from_a_stale_version_is_rejected(client, projected_updates):
+    created = (await client.post("/api/admin/giveaways", json=body("original"))).json()
+    version = created["version"]
+    path = f"/api/admin/giveaways/{created['id']}"
+
+    first = await client.put(path, json=body("first"), headers={"If-Match": f'"{version}"'})
+    assert first.status_code == 200, first.text
+    assert first.headers["X-Giveaway-Version"] == str(version + 1)
+    assert "ETag" not in first.headers
+
+    second = await client.put(path, json=body("second"), headers={"If-Match": f'"{version}"'})
+    assert second.status_code == 412
+    stored = await server.giveaway_repository.find_one(created["id"])
+    assert stored["title"] == "first"
+
+    # Retrying from the version the winner returned succeeds
+    retried = await client.put(path, json=body("second"), headers={"If-Match": f'W/"{version + 1}"'})
+    assert retried.status_code == 200, retried.text
+
+
+async def test_if_match_must_be_a_version(client):
+    created = (await client.post("/api/admin/giveaways", json=body("original"))).json()
+    response = await client.put(f"/api/admin/giveaways/{created['id']}", json=body("x"), headers={"If-Match": '"abc"'})
+    assert response.status_code == 412
+    missing = await client.put("/api/admin/giveaways/nope", json=body("x"), headers={"If-Match": '"0"'})
+    assert missing.status_code == 404
+
+
+def test_parse_if_match():
+    assert server.parse_if_match(None) is None
+    assert server.parse_if_match("*") is None
+    assert server.parse_if_match('"3"') == 3
+    assert server.parse_if_match(' W/"3" ') == 3
@@ -0,0 +1,106 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def fake_entrants(monkeypatch, user_ids):
+    async def iter_entrant_ids(giveaway_id, batch_size=1000):
+        for user_id in sorted(user_ids):
+            yield {"userId": user_id}
+    monkeypatch.setattr(server.giveaway_repository, "iter_entrant_ids", iter_entrant_ids)
+
+
+async def test_same_seed_gives_same_winners(monkeypatch):
+    fake_entrants(monkeypatch, [f"user-{i:04d}" for i in range(500)])
+    first, count = await server.draw_winners("g", 5, "seed")
+    again, _ = await server.draw_winners("g", 5, "seed")
+    other, _ = await server.draw_winners("g", 5, "other seed")
+    assert count == 500
+    assert first == again
+    assert first != other
+
+
+async def test_winners_are_distinct(monkeypatch):
+    fake_entrants(monkeypatch, [f"user-{i:04d}" for i in range(50)])
+    for seed in range(100):
+        winners, _ = await server.draw_winners("g", 10, str(seed))
+        assert len(winners) == 10
+        assert len(set(winners)) == 10
+
+
+async def test_fewer_entries_than_winners(monkeypatch):
+    fake_entrants(monkeypatch, ["a", "b", "c"])
+    winners, count = await server.draw_winners("g", 5, "seed")
+    assert sorted(winners) == ["a", "b", "c"]
+    assert count == 3
+
+    fake_entrants(monkeypatch, [])
+    assert await server.draw_winners("g", 5, "seed") == ([], 0)
+
+
+async def archived_giveaway(entrants: int) -> str:
+    repository = server.giveaway_repository
+    now = server.utcnow()
+    giveaway_id = str(uuid.uuid4())
+    await repository.archive.insert_one({
+        "id": giveaway_id,
+        "title": "Archived",
+        "description": "d",
+        "prize": "p",
+        "endDate": now - timedelta(days=60),
+        "entryRequirement": "r",
+        "createdAt": now - timedelta(days=70),
+        "version": 0,
+    })
+    await repository.upsert_entries([
+        {"giveawayId": giveaway_id, "userId": f"user-{i:03d}", "createdAt": now} for i in range(entrants)
+    ])
+    return giveaway_id
+
+
+async def test_stored_draw_replays_after_archiving(client):
+    giveaway_id = await archived_giveaway(200)
+    winners, count = await server.draw_winners(giveaway_id, 3, "audit-seed")
+    await server.giveaway_repository.archive.update_one({"id": giveaway_id}, {"$set": {"draw": {
+        "seed": "audit-seed",
+        "algorithm": server.DRAW_ALGORITHM,
+        "winnersRequested": 3,
+        "winners": winners,
+        "entryCount": count,
+        "drawnAt": server.utcnow(),
+    }}})
+
+    response = await client.get(f"/api/admin/giveaways/{giveaway_id}/draw")
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["verified"] is True
+    assert body["replayedWinners"] == winners
+
+    # A tampered record no longer verifies
+    await server.giveaway_repository.archive.update_one({"id": giveaway_id}, {"$set": {"draw.winners": ["someone-else"]}})
+    response = await client.get(f"/api/admin/giveaways/{giveaway_id}/draw")
+    assert response.json()["verified"] is False
+
+
+async def test_archived_giveaway_can_be_drawn(client, monkeypatch):
+    update = server.giveaway_repository.update
+
+    async def update_then_project(giveaway_id, update_data, expected_version=None, projection=None, archived=False):
+        # mongomock returns nothing when projecting find_one_and_update on a filtered field
+        doc = await update(giveaway_id, update_data, expected_version, None, archived)
+        return doc and {key: value for key, value in doc.items() if key in projection}
+    monkeypatch.setattr(server.giveaway_repository, "update", update_then_project)
+
+    giveaway_id = await archived_giveaway(20)
+    response = await client.post(f"/api/admin/giveaways/{giveaway_id}/draw?winners=2")
+    assert response.status_code == 200, response.text
+    assert len(response.json()["winners"]) == 2
+    stored = await server.giveaway_repository.archive.find_one({"id": giveaway_id})
+    assert stored["draw"]["seed"] == response.json()["seed"]
+    assert (await client.post(f"/api/admin/giveaways/{giveaway_id}/draw")).status_code == 409
+    assert (await client.get(f"/api/admin/giveaways/{giveaway_id}/draw")).json()["verified"] is True
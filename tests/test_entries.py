@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_giveaway(client, ends_in: timedelta) -> str:
+    response = await client.post("/api/admin/giveaways", json={
+        "title": "t",
+        "description": "d",
+        "prize": "p",
+        "endDate": (server.utcnow() + ends_in).isoformat(),
+        "entryRequirement": "r",
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+async def enter(client, giveaway_id: str, user_id: str):
+    return await client.post(f"/api/giveaways/{giveaway_id}/entries", json={"userId": user_id})
+
+
+async def test_repeat_entries_are_not_counted_twice(client):
+    giveaway_id = await create_giveaway(client, timedelta(days=1))
+    assert (await enter(client, giveaway_id, "u1")).json()["accepted"] is True
+    second = (await enter(client, giveaway_id, "u1")).json()
+    assert second["accepted"] is False and second["entryCount"] == 1
+
+
+async def test_entrants_are_dropped_once_a_giveaway_ends(client, monkeypatch):
+    giveaway_id = await create_giveaway(client, timedelta(days=1))
+    other_id = await create_giveaway(client, timedelta(days=2))
+    for user_id in ("u1", "u2"):
+        await enter(client, giveaway_id, user_id)
+    await enter(client, other_id, "u1")
+    assert giveaway_id in server.entry_buffer._entrants
+
+    later = server.utcnow() + timedelta(days=1, minutes=1)
+    monkeypatch.setattr(server, "utcnow", lambda: later)
+    server.expiry_watcher.sweep()
+    assert giveaway_id not in server.entry_buffer._entrants
+    assert other_id in server.entry_buffer._entrants
+    assert server.entry_buffer.count(giveaway_id) == 2
+    assert (await enter(client, giveaway_id, "u3")).status_code == 409
+
+
+async def test_entrants_are_dropped_when_an_edit_ends_a_giveaway(client):
+    giveaway_id = await create_giveaway(client, timedelta(days=1))
+    await enter(client, giveaway_id, "u1")
+    server.giveaway_counters.updated(giveaway_id, server.utcnow() - timedelta(minutes=1))
+    assert giveaway_id not in server.entry_buffer._entrants
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+import pytest
+
+import server
+
+from .test_pagination import giveaway_doc
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed(count: int):
+    now = server.utcnow().replace(microsecond=0)
+    await server.giveaway_repository.collection.insert_many(
+        [giveaway_doc(now - timedelta(minutes=i), now + timedelta(days=1), description="d" * 200) for i in range(count)]
+    )
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "identity"])
+async def test_revalidation_returns_not_modified(client, encoding):
+    await seed(20)
+    headers = {"Accept-Encoding": encoding}
+
+    first = await client.get("/api/giveaways", headers=headers)
+    assert first.status_code == 200, first.text
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert (first.headers.get("Content-Encoding") == "gzip") == (encoding == "gzip")
+
+    second = await client.get("/api/giveaways", headers={**headers, "If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert second.content == b""
+
+
+async def test_gzip_and_identity_share_only_a_weak_validator(client):
+    await seed(20)
+    gzipped = await client.get("/api/giveaways", headers={"Accept-Encoding": "gzip"})
+    identity = await client.get("/api/giveaways", headers={"Accept-Encoding": "identity"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in identity.headers
+    assert gzipped.headers["ETag"] == identity.headers["ETag"]
+    assert gzipped.headers["ETag"].startswith("W/")
+
+    revalidated = await client.get(
+        "/api/giveaways", headers={"Accept-Encoding": "identity", "If-None-Match": gzipped.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
@@ -0,0 +1,30 @@
+import asyncio
+import json
+
+import pytest
+
+import server
+
+
+def test_sources_must_implement_fetch():
+    with pytest.raises(TypeError):
+        server.MemberCountSource()
+
+
+def test_file_source_reads_off_the_event_loop(tmp_path, monkeypatch):
+    path = tmp_path / "members.json"
+    path.write_text(json.dumps({"memberCount": 1234}))
+    offloaded = []
+    to_thread = asyncio.to_thread
+
+    async def recording_to_thread(func, *args, **kwargs):
+        offloaded.append(func)
+        return await to_thread(func, *args, **kwargs)
+    monkeypatch.setattr(server.asyncio, "to_thread", recording_to_thread)
+
+    source = server.member_count_source_from_spec(f"file:{path}")
+    assert asyncio.run(source.fetch()) == 1234
+    assert offloaded
+
+    path.write_text("77")
+    assert asyncio.run(source.fetch()) == 77
@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+from tests.conftest import BACKEND_DIR
+
+SCRAPE = """
+import asyncio, httpx, server
+async def scrape():
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/metrics")
+        print(response.status_code)
+        print(response.text)
+server.HTTP_REQUESTS.labels("GET", "/api/stats", "200").inc(2)
+asyncio.run(scrape())
+"""
+
+
+def scrape_worker(**env):
+    result = subprocess.run(
+        [sys.executable, "-c", SCRAPE],
+        cwd=BACKEND_DIR, env={**os.environ, **env}, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    status, _, body = result.stdout.partition("\n")
+    return int(status), body
+
+
+def test_workers_share_metrics_through_the_multiprocess_directory(tmp_path):
+    first_status, _ = scrape_worker(WEB_CONCURRENCY="2", PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    status, body = scrape_worker(WEB_CONCURRENCY="2", PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    assert first_status == status == 200
+    # Two processes each counted two requests
+    assert 'http_requests_total{method="GET",route="/api/stats",status="200"} 4.0' in body
+
+
+def test_metrics_refuse_to_report_one_worker_of_several():
+    status, body = scrape_worker(WEB_CONCURRENCY="2")
+    assert status == 503
+    assert "PROMETHEUS_MULTIPROC_DIR" in body
@@ -0,0 +1,32 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_migrations_run_once_and_are_recorded(client, monkeypatch):
+    repository = server.giveaway_repository
+    await repository.migrations.delete_many({})
+    giveaway_id = str(uuid.uuid4())
+    await repository.collection.insert_one({
+        "id": giveaway_id,
+        "title": "Legacy",
+        "endDate": "2030-01-01T00:00:00Z",
+        "createdAt": "2020-01-01T00:00:00Z",
+    })
+
+    await server.prepare_collection()
+    doc = await repository.collection.find_one({"id": giveaway_id})
+    assert isinstance(doc["endDate"], datetime)
+    assert doc["version"] == 0
+    assert await repository.migrations.count_documents({}) == 2
+
+    async def scan():
+        raise AssertionError("migration ran again")
+    monkeypatch.setattr(repository, "migrate_dates", scan)
+    monkeypatch.setattr(repository, "backfill_versions", scan)
+    await server.prepare_collection()
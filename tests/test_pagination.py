@@ -0,0 +1,83 @@
+import base64
+import json
+import uuid
+from datetime import timedelta
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def giveaway_doc(created_at, end_date, **extra):
+    return {
+        "id": str(uuid.uuid4()),
+        "title": "Giveaway",
+        "description": "d",
+        "prize": "Nitro",
+        "endDate": end_date,
+        "entryRequirement": "r",
+        "createdAt": created_at,
+        "version": 0,
+        **extra,
+    }
+
+
+def raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+async def walk(client, path: str, **params):
+    pages, after = [], None
+    while True:
+        response = await client.get(path, params={**params, **({"after": after} if after else {})})
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        after = response.headers.get("x-next-cursor")
+        if not after:
+            return pages
+
+
+async def test_list_pages_cover_every_giveaway_once(client):
+    now = server.utcnow().replace(microsecond=0)
+    # Shared timestamps make the id tie-breaker matter
+    docs = [giveaway_doc(now - timedelta(minutes=i // 2), now + timedelta(days=1)) for i in range(7)]
+    await server.giveaway_repository.collection.insert_many([dict(doc) for doc in docs])
+
+    pages = await walk(client, "/api/giveaways", limit=2)
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+    seen = [giveaway["id"] for page in pages for giveaway in page]
+    expected = sorted(docs, key=lambda doc: (doc["createdAt"], doc["id"]), reverse=True)
+    assert seen == [doc["id"] for doc in expected]
+
+
+async def test_list_pages_include_the_archive(client):
+    now = server.utcnow().replace(microsecond=0)
+    live = [giveaway_doc(now - timedelta(minutes=i), now + timedelta(days=1)) for i in range(3)]
+    archived = [giveaway_doc(now - timedelta(minutes=i, seconds=30), now - timedelta(days=40)) for i in range(3)]
+    await server.giveaway_repository.collection.insert_many(live)
+    await server.giveaway_repository.archive.insert_many(archived)
+
+    pages = await walk(client, "/api/giveaways", limit=4, include="archived")
+    seen = [giveaway["id"] for page in pages for giveaway in page]
+    assert len(seen) == len(set(seen)) == 6
+    assert len(await walk(client, "/api/giveaways", limit=4)) == 1
+
+
+async def test_fields_select_what_is_returned(client):
+    now = server.utcnow()
+    await server.giveaway_repository.collection.insert_many(
+        [giveaway_doc(now - timedelta(minutes=i), now + timedelta(days=1)) for i in range(3)]
+    )
+    pages = await walk(client, "/api/giveaways", limit=2, fields="title")
+    assert all(set(giveaway) == {"id", "title"} for page in pages for giveaway in page)
+    assert sum(len(page) for page in pages) == 3
+    assert (await client.get("/api/giveaways", params={"fields": "secret"})).status_code == 400
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", raw_cursor([1, "x"]), raw_cursor(["yesterday", "x"]), raw_cursor(5)])
+async def test_malformed_list_cursors_are_rejected(client, cursor):
+    response = await client.get("/api/giveaways", params={"after": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,37 @@
+import server
+
+
+def scope(forwarded=None, client=("10.0.0.1", 5000)):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded is not None else []
+    return {"type": "http", "path": "/api/stats", "headers": headers, "client": client}
+
+
+def test_client_key_uses_the_hop_the_proxy_appended():
+    key = server.RateLimitMiddleware.client_key
+    # The client sent "1.1.1.1" itself; the proxy appended the real peer
+    assert key(scope("1.1.1.1, 203.0.113.7"), 1) == "203.0.113.7"
+    assert key(scope("1.1.1.1, 203.0.113.7, 10.1.1.1"), 2) == "203.0.113.7"
+
+
+def test_client_key_falls_back_to_the_socket_peer():
+    key = server.RateLimitMiddleware.client_key
+    assert key(scope("1.1.1.1"), 0) == "10.0.0.1"
+    assert key(scope(), 1) == "10.0.0.1"
+    assert key(scope("203.0.113.7"), 2) == "10.0.0.1"
+
+
+def test_limiter_spends_burst_then_reports_wait():
+    limiter = server.TokenBucketLimiter({"login": (1 / 60, 2)})
+    assert limiter.acquire("login", "a") == 0
+    assert limiter.acquire("login", "a") == 0
+    assert 59 < limiter.acquire("login", "a") <= 60
+    # Budgets are per client
+    assert limiter.acquire("login", "b") == 0
+
+
+def test_limiter_stays_bounded_under_a_flood_of_clients():
+    limiter = server.TokenBucketLimiter({"public": (1, 5)}, max_buckets=100)
+    for i in range(1000):
+        limiter.acquire("public", f"client-{i}")
+    assert len(limiter._buckets) <= 100
+    assert ("public", "client-999") in limiter._buckets
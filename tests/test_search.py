@@ -0,0 +1,61 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+
+import server
+from tests.test_pagination import raw_cursor, walk
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed(count: int, prize=lambda i: "Nitro"):
+    now = server.utcnow().replace(microsecond=0)
+    docs = [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Giveaway {i}",
+            "description": "d",
+            "prize": prize(i),
+            # Pairs share an endDate so the id tie-breaker matters
+            "endDate": now + timedelta(hours=1 + i // 2),
+            "entryRequirement": "r",
+            "createdAt": now,
+            "version": 0,
+        }
+        for i in range(count)
+    ]
+    await server.giveaway_repository.collection.insert_many([dict(doc) for doc in docs])
+    return docs
+
+
+async def test_search_pages_follow_end_date_order(client):
+    docs = await seed(7)
+    pages = await walk(client, "/api/giveaways/search", limit=2)
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+    seen = [giveaway["id"] for page in pages for giveaway in page]
+    assert seen == [doc["id"] for doc in sorted(docs, key=lambda doc: (doc["endDate"], doc["id"]))]
+
+
+async def test_search_pages_keep_their_filters(client):
+    docs = await seed(8, prize=lambda i: "Nitro" if i % 2 else "Steam")
+    cutoff = docs[6]["endDate"]
+    pages = await walk(
+        client, "/api/giveaways/search", limit=2, prize="Nitro", endsBefore=cutoff.isoformat(), fields="prize"
+    )
+    seen = [giveaway for page in pages for giveaway in page]
+    expected = [doc for doc in docs if doc["prize"] == "Nitro" and doc["endDate"] < cutoff]
+    assert [giveaway["id"] for giveaway in seen] == [doc["id"] for doc in expected]
+    assert all(set(giveaway) == {"id", "prize"} for giveaway in seen)
+
+
+@pytest.mark.parametrize("cursor", [
+    raw_cursor(["endDate", 5, "x"]),
+    raw_cursor(["score", 1.5, "x"]),
+    raw_cursor(["endDate", "soon", "x"]),
+    raw_cursor(["endDate", "2030-01-01T00:00:00Z"]),
+])
+async def test_malformed_search_cursors_are_rejected(client, cursor):
+    response = await client.get("/api/giveaways/search", params={"after": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"